@@ -1,19 +1,34 @@
-import pygame
+import argparse
+import math
+import os
 import random
 import sys
+import time
+from collections import deque
+
+import pygame
+
+from motor_serpiente import MotorSerpiente, ANCHO_TABLERO, ALTO_TABLERO, ARRIBA, ABAJO, IZQUIERDA, DERECHA
+from cliente_red import ClientePredictivo
+from perfil_fases import PerfilFases
+from piloto_automatico import PilotoAutomatico
+from render_serpiente import CacheTexto, FondoDesplazable, RenderizadorRectsSucios, SpritesSerpiente
+from repeticion import GrabadorPartida
 
 # =================================================================
 # 1. CONFIGURACIÓN INICIAL DE PYGAME Y CONSTANTES DEL JUEGO
 # =================================================================
 
-# Inicializar Pygame
-pygame.init()
-
 # Constantes de la Ventana y la Cuadrícula
 ANCHO_VENTANA = 800 # Ancho total de la ventana en píxeles
 ALTURA_VENTANA = 500  # Altura total de la ventana en píxeles
-TAMANO_ELEMENTO = 20  # Tamaño de cada segmento de la serpiente y la manzana (define la cuadrícula)
-FPS = 10 # Velocidad del juego (frames por segundo)
+TAMANO_ELEMENTO = 20  # Tamaño máximo de cada celda en píxeles (se achica si el tablero no entra en la ventana)
+TICKS_POR_SEGUNDO = 10 # Velocidad del juego (movimientos de la serpiente por segundo)
+FPS = 60 # Frames dibujados por segundo (independiente de la lógica)
+INTERPOLAR = True # Dibuja la serpiente deslizándose entre un tick y el siguiente
+MAX_TICKS_POR_FRAME = 5 # Si un frame se atrasa mucho no se intenta recuperar todo de golpe
+MODO_CHOQUE_CUERPO = False # True = modo clásico: chocar con el propio cuerpo termina el juego
+RUTA_GRABACION = None # Ej: "partida.snkr" para grabar la partida (se repite con: python repeticion.py partida.snkr)
 
 # Colores (Tuplas RGB)
 BLANCO = (255, 255, 255)
@@ -23,270 +38,436 @@ VERDE_CUERPO = (0, 150, 0) # Color del cuerpo
 ROJO = (255, 0, 0)
 GRIS = (240, 240, 240) # Color de fondo
 
-# Pantalla
-pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTURA_VENTANA)) # Crea la ventana
-pygame.display.set_caption("Snake Clásico (Modo Teletransporte)") # Establece el título de la ventana
-
-# Reloj para controlar el FPS
-reloj = pygame.time.Clock()
-
-# Dirección inicial (Vector de movimiento por paso: X, Y)
-DIRECCION_INICIAL = (TAMANO_ELEMENTO, 0) # Inicialmente se mueve a la derecha (20 píxeles en X)
+# Fondo en movimiento (opcional)
+FONDO_IMAGEN_RUTA = "fondo_bosque.png"
+VELOCIDAD_FONDO = 0.5 # Velocidad de desplazamiento del fondo
+USAR_FONDO_ANIMADO = False # Con el fondo en movimiento hay que repintar toda la pantalla cada frame
+
+# Con fondo liso solo se repintan las zonas que cambiaron (cabeza, cola, manzana y puntuación).
+# Al interpolar en este modo el cuerpo queda quieto y solo se deslizan la cabeza y la cola
+# (con MODO_RECTS_SUCIOS = False se repinta todo y se desliza cada segmento).
+MODO_RECTS_SUCIOS = True
+
+# Medición por fases de cada frame (buffer circular de los últimos frames)
+FASES_FRAME = ("eventos", "logica", "fondo", "escena", "hud", "flip")
+FRAMES_PERFIL = 600 # Frames que guarda el buffer (10 s a 60 FPS)
+TECLA_PERFIL = pygame.K_F3 # Muestra/oculta el overlay con p50/p99 por fase
+FRAMES_ENTRE_PERCENTILES = 30 # Cada cuántos frames se recalcula el overlay
+
+MUESTRAS_LATENCIA = 256 # Últimas latencias tecla -> movimiento que se guardan para ajustar la entrada
+TECLA_PILOTO = pygame.K_p # Activa/desactiva el piloto automático (una flecha le devuelve el control al jugador)
+
+# Teclas -> dirección en celdas del motor
+TECLAS_DIRECCION = {
+    pygame.K_UP: ARRIBA,
+    pygame.K_DOWN: ABAJO,
+    pygame.K_LEFT: IZQUIERDA,
+    pygame.K_RIGHT: DERECHA,
+}
 
 # =================================================================
-# 2. CLASE DE MECÁNICAS DE LA MANZANA (MecanicasManzana)
+# 2. CLASE DEL JUEGO (JuegoSerpiente)
+# Las reglas viven en motor_serpiente.MotorSerpiente (sin pygame);
+# esta clase solo traduce celdas a píxeles y dibuja.
 # =================================================================
-class MecanicasManzana:
-    def __init__(self):
-        # Límites máximos para que la manzana no aparezca fuera de la ventana
-        self.maximo_x = ANCHO_VENTANA - TAMANO_ELEMENTO
-        self.maximo_y = ALTURA_VENTANA - TAMANO_ELEMENTO
-        self.manzana_x = 0 # Coordenada X inicial
-        self.manzana_y = 0 # Coordenada Y inicial
-
-    def colocar_manzana_random(self, segmento_serpiente_x, segmento_serpiente_y, direccion_actual, segmentos_serpiente):
-        """
-        Coloca la manzana en un punto aleatorio, priorizando la mitad de la ventana
-        hacia donde se dirige la serpiente, y asegurando que no aparezca en el cuerpo.
-        
-        MEJORA: Uso de set (conjunto) para coords_a_evitar y listas por comprensión para posiciones_validas.
-        """
-        dx, dy = direccion_actual
-        
-        mitad_ancho = ANCHO_VENTANA // 2
-        mitad_altura = ALTURA_VENTANA // 2
-        
-        min_x, max_x, min_y, max_y = 0, self.maximo_x, 0, self.maximo_y
-        
-        # Ajustar límites según la dirección (Crear la "mitad delantera")
-        if dx > 0: # Derecha
-            min_x = mitad_ancho
-        elif dx < 0: # Izquierda
-            max_x = mitad_ancho - TAMANO_ELEMENTO 
-        elif dy > 0: # Abajo
-            min_y = mitad_altura
-        elif dy < 0: # Arriba
-            max_y = mitad_altura - TAMANO_ELEMENTO 
-
-        # Crea listas de pasos X e Y que cumplen con la cuadrícula (TAMANO_ELEMENTO) y el rango de la "mitad delantera"
-        x_pasos = list(range(min_x // TAMANO_ELEMENTO, (max_x + TAMANO_ELEMENTO) // TAMANO_ELEMENTO))
-        y_pasos = list(range(min_y // TAMANO_ELEMENTO, (max_y + TAMANO_ELEMENTO) // TAMANO_ELEMENTO))
-        
-        # Crea un CONJUNTO de coordenadas de cuadrícula ocupadas por la serpiente.
-        coords_a_evitar = set((x // TAMANO_ELEMENTO, y // TAMANO_ELEMENTO) for x, y in segmentos_serpiente)
-
-        #  Usa lista por comprensión para generar posiciones_validas 
-        posiciones_validas = [
-            (xs * TAMANO_ELEMENTO, ys * TAMANO_ELEMENTO) 
-            for xs in x_pasos 
-            for ys in y_pasos 
-            if (xs, ys) not in coords_a_evitar
-        ]
-        
-        if not posiciones_validas:
-            self.colocar_manzana_segura(segmentos_serpiente) # Llamada de respaldo si no hay espacio en la mitad delantera
-            return
-
-        self.manzana_x, self.manzana_y = random.choice(posiciones_validas) # Elige una posición válida al azar
-
-    def colocar_manzana_segura(self, segmentos_serpiente):
-        """
-        Método de respaldo   busca en toda la ventana y evita el cuerpo.
-        
-         Ademas usa  conjuntos para coords_a_evitar y listas por comprensión para posiciones_validas.
-        """
-        max_x_pasos = self.maximo_x // TAMANO_ELEMENTO
-        max_y_pasos = self.maximo_y // TAMANO_ELEMENTO
-        
-        #Crear un CONJUNTO de coordenadas de cuadrícula ocupadas por la serpiente.
-        coords_a_evitar = set((x // TAMANO_ELEMENTO, y // TAMANO_ELEMENTO) for x, y in segmentos_serpiente)
-
-        #  Usa lista por comprensión para generar posiciones_validas .
-        # Itera sobre toda la cuadrícula de la ventana
-        posiciones_validas = [
-            (xs * TAMANO_ELEMENTO, ys * TAMANO_ELEMENTO) 
-            for xs in range(max_x_pasos + 1)
-            for ys in range(max_y_pasos + 1)
-            if (xs, ys) not in coords_a_evitar#evita manzanas fuera de ventana o cuerpo de la serpiente
-        ]
-        
-        if not posiciones_validas:
-            print("ERROR : ¡No hay espacio para generar la manzana!")
-            return
-
-        self.manzana_x, self.manzana_y = random.choice(posiciones_validas)#una vez hecho el calculo elije una posicion random de las validas
-        print(f"🍏 Nueva Manzana (Respaldo) en: ({self.manzana_x}, {self.manzana_y})")
-
-    def obtener_coordenadas(self):
-        """Retorna la posición actual (x, y) de la manzana."""
-        return self.manzana_x, self.manzana_y
 
-    def dibujar(self, superficie):
-        """Dibuja la manzana en la superficie de la pantalla."""
-        manzana_rect = pygame.Rect(self.manzana_x, self.manzana_y, TAMANO_ELEMENTO, TAMANO_ELEMENTO)
-        # Dibuja un círculo rojo, centrado en el segmento de la cuadrícula
-        pygame.draw.circle(superficie, ROJO, manzana_rect.center, TAMANO_ELEMENTO // 2 - 2) 
+def tamano_celda(ancho, alto):
+    """Lado de la celda en píxeles para que un tablero de ancho x alto celdas entre en la ventana."""
+    tamano = min(TAMANO_ELEMENTO, ANCHO_VENTANA // ancho, ALTURA_VENTANA // alto)
+    if tamano < 1:
+        raise ValueError(f"El tablero {ancho}x{alto} no entra en la ventana de {ANCHO_VENTANA}x{ALTURA_VENTANA}; "
+                         "para tableros más grandes usar el motor sin ventana (motor_serpiente / bench_motor.py)")
+    return tamano
 
-# =================================================================
-# 3. CLASE DE LA SERPIENTE Y LÓGICA DEL JUEGO (JuegoSerpiente)
-# =================================================================
 
 class JuegoSerpiente:
-    def __init__(self):
-        # Calcular la posición inicial centrada y alineada a la cuadrícula
-        centro_x = (ANCHO_VENTANA // 2) - (TAMANO_ELEMENTO // 2)
-        centro_y = (ALTURA_VENTANA // 2) - (TAMANO_ELEMENTO // 2)
-        inicio_x = (centro_x // TAMANO_ELEMENTO) * TAMANO_ELEMENTO
-        inicio_y = (centro_y // TAMANO_ELEMENTO) * TAMANO_ELEMENTO
-        
-        self.segmentos = [(inicio_x, inicio_y)] # Lista que almacena las coordenadas de cada segmento de la serpiente
-        self.puntuacion = 0
-        self.mecanicas_manzana = MecanicasManzana() # Crea el objeto manzana
-        self.mecanicas_manzana.colocar_manzana_random(inicio_x, inicio_y, DIRECCION_INICIAL, self.segmentos)
-        
+    def __init__(self, semilla=None, choque_cuerpo=MODO_CHOQUE_CUERPO, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO):
+        # El tablero (en celdas) es independiente de la ventana: solo cambia el tamaño de la celda
+        self.tamano = tamano_celda(ancho, alto)
+        self.motor = MotorSerpiente(ancho, alto, semilla, choque_cuerpo)
         self.imagen_cabeza_serpiente = self.cargar_imagen_serpiente() # Carga la imagen de la cabeza
-        self.direccion_actual = DIRECCION_INICIAL # Establece la dirección inicial
+        # Baldosas de cabeza, cuerpo y manzana dibujadas una sola vez
+        self.sprites = SpritesSerpiente(self.motor.ancho, self.motor.alto, self.tamano, self.imagen_cabeza_serpiente,
+                                        VERDE_CABEZA, VERDE_CUERPO, ROJO)
+        self.texto_puntuacion = CacheTexto(36, BLANCO) # Fuente cargada una vez y textos ya dibujados
+        self.grabador = GrabadorPartida(self.motor) if RUTA_GRABACION else None
+        self.instantes_entrada = deque() # Momento de cada tecla cuyo giro sigue en la cola del motor
+        self.latencias = deque(maxlen=MUESTRAS_LATENCIA) # Segundos entre la tecla y el tick que aplicó el giro
+        self.cliente = None # ClientePredictivo cuando se juega contra un servidor (ver iniciar_red)
+        self.piloto = None # PilotoAutomatico (sus buffers se crean la primera vez que se activa)
+        self.piloto_activo = False
+
+    @property
+    def segmentos(self):
+        """Coordenadas en píxeles de cada segmento (la cabeza primero)."""
+        return [(x * self.tamano, y * self.tamano) for x, y in self.motor.segmentos]
+
+    @property
+    def puntuacion(self):
+        return self.motor.puntuacion
 
     def cargar_imagen_serpiente(self):
         """Carga la imagen de la cabeza  y la coloca a escala adecuada para la ventana."""
         ruta_imagen = "cabeza_serpiente.png" 
         try:
             imagen = pygame.image.load(ruta_imagen).convert_alpha()#Si la imagen tiene fondo transparente, usa siempre convert_alpha().
-            imagen_escalada = pygame.transform.scale(imagen, (TAMANO_ELEMENTO, TAMANO_ELEMENTO))#ajusta el tamaño
+            imagen_escalada = pygame.transform.scale(imagen, (self.tamano, self.tamano))#ajusta el tamaño
             return imagen_escalada
         except pygame.error:
             return None # Retorna None si el archivo no se encuentra
 
     def dibujar_puntuacion(self, superficie):
         """Dibuja la puntuación actual en la superficie del juego. 
-        Y personaliza algunos aspectos de esta"""
-        fuente = pygame.font.Font(None, 36)
-        texto = fuente.render(f"Puntuación: {self.puntuacion}", True, BLANCO) 
-        fondo_texto = pygame.Rect(10, 10, texto.get_width() + 10, texto.get_height() + 10)
-        pygame.draw.rect(superficie, (51, 51, 51), fondo_texto, border_radius=5) 
-        superficie.blit(texto, (15, 15))#blit = copiar un Surface(superficie) dentro de otro Surface
+        Y personaliza algunos aspectos de esta.
+        MEJORA: el texto con su caja solo se renderiza cuando cambia la puntuación (CacheTexto)."""
+        caja = self.texto_puntuacion.caja(f"Puntuación: {self.puntuacion}")
+        return superficie.blit(caja, (10, 10)) # blit retorna la zona ocupada (la usa el renderizador de rects sucios)
+
+    def dibujar_manzana(self, superficie):
+        """Dibuja la manzana en la superficie de la pantalla (baldosa con el círculo rojo ya dibujado)."""
+        manzana_x, manzana_y = self.motor.mecanicas_manzana.obtener_coordenadas()
+        self.sprites.dibujar_manzana(superficie, manzana_x * self.tamano, manzana_y * self.tamano)
+
+    def dibujar_segmento(self, superficie, x, y, es_cabeza):
+        """Dibuja un segmento en la posición en píxeles (x, y)."""
+        # Cabeza: imagen si está disponible, sino color VERDE_CABEZA. Cuerpo: VERDE_CUERPO
+        self.sprites.dibujar_segmento(superficie, x, y, es_cabeza)
 
     def dibujar_serpiente(self, superficie):
-        """Dibuja cada segmento de la serpiente (cabeza y cuerpo)."""
-        for i, (x, y) in enumerate(self.segmentos):#recorre los segmentos de la serpiente
-            segmento_rect = pygame.Rect(x, y, TAMANO_ELEMENTO, TAMANO_ELEMENTO)
-            if i == 0:
-                # Dibuja la cabeza (usa imagen si está disponible, sino color VERDE_CABEZA)
-                if self.imagen_cabeza_serpiente:
-                    superficie.blit(self.imagen_cabeza_serpiente, segmento_rect.topleft)
-                else:
-                    pygame.draw.rect(superficie, VERDE_CABEZA, segmento_rect) 
-            else:
-                # Dibuja el cuerpo
-                pygame.draw.rect(superficie, VERDE_CUERPO, segmento_rect) 
+        """
+        Dibuja cada segmento de la serpiente (cabeza y cuerpo).
+        MEJORA: una sola llamada a blits con baldosas pre-renderizadas, sin un Rect por segmento.
+        """
+        self.sprites.dibujar_serpiente(superficie, self.motor.cuerpo)
 
-    def mover_serpiente(self):
+    def dibujar_tablero(self, superficie, alfa=None, puntas=False):
         """
-        Calcula el nuevo movimiento.
-        
+        Dibuja manzana y serpiente sobre el fondo ya pintado.
+        alfa (0 a 1) es cuánto del tick siguiente ya pasó: con alfa la serpiente se dibuja
+        a mitad de camino entre su posición anterior y la actual. Con puntas=True solo se
+        deslizan la cabeza y la cola (lo que dibuja el renderizador de rects sucios).
         """
-        dx, dy = self.direccion_actual
-        cabeza_x, cabeza_y = self.segmentos[0]#posicion cabeza
-        
-        # Calcular la siguiente posición sin aplicar límites aún
-        siguiente_x = cabeza_x + dx
-        siguiente_y = cabeza_y + dy
-
-        # 1. Aplica el efecto de teletransporte  si se topa con el limite de ventana
-        siguiente_x = siguiente_x % ANCHO_VENTANA
-        siguiente_y = siguiente_y % ALTURA_VENTANA
-
-        # Asegura que si la posición es negativa (al salir por la izquierda o arriba) 
-        # se ajuste correctamente al extremo opuesto.
-        if siguiente_x < 0:
-            siguiente_x += ANCHO_VENTANA
-        if siguiente_y < 0:
-            siguiente_y += ALTURA_VENTANA
-
-        # 2. Mueve el cuerpo: Inserta la nueva cabeza(al cuerpo)
-        nueva_cabeza = (siguiente_x, siguiente_y)
-        self.segmentos.insert(0, nueva_cabeza)
-        
-        
-
-        # 3. Colisión con manzana
-        esta_comiendo = self.chequeo_colision_manzana()
-        
-        if not esta_comiendo:
-            self.segmentos.pop() # Elimina la cola si NO comió (simula el movimiento)
-        
-        return True # El movimiento fue exitoso
-
-    def chequeo_colision_manzana(self):
-        """Verifica si la cabeza choca con la manzana, viendo si ambas coords son iguales"""
-        cabeza_x, cabeza_y = self.segmentos[0]
-        manzana_x, manzana_y = self.mecanicas_manzana.obtener_coordenadas()
-        
-        if cabeza_x == manzana_x and cabeza_y == manzana_y:
-            self.puntuacion += 1 # Incrementa la puntuación
-            print(f"🎉 ¡COLISIÓN! Puntuación actual: {self.puntuacion}")
-            
-            # Coloca una nueva manzana lejos del cuerpo
-            self.mecanicas_manzana.colocar_manzana_random(cabeza_x, cabeza_y, self.direccion_actual, self.segmentos)
-            
-            return True # La serpiente creció
-        
-        return False
+        self.dibujar_manzana(superficie) # Dibuja la manzana
+        if alfa is None:
+            self.dibujar_serpiente(superficie) # Dibuja la serpiente
+        elif puntas:
+            self.sprites.dibujar_serpiente_puntas(superficie, self.motor.cuerpo, self.motor.cola_anterior, alfa)
+        else:
+            self.sprites.dibujar_serpiente_interpolada(superficie, self.motor.cuerpo, self.motor.cola_anterior, alfa)
+
+    def dibujar_escena(self, superficie, alfa=None):
+        """Dibuja manzana, serpiente y puntuación sobre el fondo ya pintado. Retorna la caja de puntuación."""
+        self.dibujar_tablero(superficie, alfa)
+        return self.dibujar_puntuacion(superficie) # Dibuja la puntuación
+
+    def iniciar_red(self, cliente):
+        """Juega contra un servidor: el motor local predice la partida y el cliente lo corrige."""
+        cliente.iniciar(self.motor)
+        self.cliente = cliente
+        self.grabador = None # Los rebobinados cambian ticks ya jugados: la grabación la haría el servidor
+
+    def alternar_piloto(self):
+        """Activa o desactiva el piloto automático (no en red: ahí los giros los confirma el servidor)."""
+        if self.cliente:
+            return
+        if self.piloto is None:
+            self.piloto = PilotoAutomatico(self.motor.ancho, self.motor.alto)
+        self.piloto_activo = not self.piloto_activo
+        self.motor.giros_pendientes.clear() # Las teclas de antes no se aplican después
+        self.instantes_entrada.clear()
+
+    def mover_serpiente(self):
+        """Avanza un tick del motor (teletransporte, manzana y crecimiento).
+        Retorna False si la serpiente chocó con su cuerpo (solo en modo choque y sin servidor)."""
+        if self.cliente:
+            # En red el cliente aplica sus giros programados y guarda la foto del tick.
+            # Un choque local no termina el juego: solo el FIN del servidor (cliente.terminado)
+            if self.cliente.puede_avanzar():
+                self.cliente.step()
+            return True
+        if self.piloto_activo:
+            antes = self.motor.direccion_actual
+            vivo = self.motor.step(self.piloto.elegir(self.motor))
+            if self.grabador and self.motor.direccion_actual != antes:
+                self.grabador.registrar(self.motor.direccion_actual, self.motor.ticks - 1)
+            return vivo
+        vivo = self.motor.step() # Aplica como máximo un giro de la cola
+        giro = self.motor.giro_aplicado
+        if giro:
+            self.latencias.append(time.perf_counter() - self.instantes_entrada.popleft())
+            if self.grabador:
+                self.grabador.registrar(giro, self.motor.ticks - 1) # Solo se graban los giros aplicados
+        return vivo
 
     def manejar_entrada(self, tecla):
-        """Maneja la entrada del teclado y actualiza la dirección dependiendo el evento de presion de tecla."""
-        dx, dy = self.direccion_actual
-        
-        nueva_direccion = None
-        
-        # Cambia la dirección si no es la opuesta a la actual (ej: no puede ir de derecha a izquierda instantáneamente)
-        if tecla == pygame.K_UP:
-            if dy == 0: nueva_direccion = (0, -TAMANO_ELEMENTO) # Moverse -Y (hacia arriba)
-        elif tecla == pygame.K_DOWN:
-            if dy == 0: nueva_direccion = (0, TAMANO_ELEMENTO) # Moverse +Y (hacia abajo)
-        elif tecla == pygame.K_LEFT:
-            if dx == 0: nueva_direccion = (-TAMANO_ELEMENTO, 0) # Moverse -X (hacia izquierda)
-        elif tecla == pygame.K_RIGHT:
-            if dx == 0: nueva_direccion = (TAMANO_ELEMENTO, 0) # Moverse +X (hacia derecha)
-                
-        if nueva_direccion:
-            self.direccion_actual = nueva_direccion # Aplica la nueva dirección
+        """
+        Maneja la entrada del teclado: el giro se deja en la cola del motor, que
+        aplica uno por tick. Así dos teclas rápidas no se pisan y la dirección
+        opuesta se revisa contra el último giro pedido, no contra uno sin aplicar.
+        """
+        nueva_direccion = TECLAS_DIRECCION.get(tecla)
+        if nueva_direccion and self.piloto_activo:
+            self.piloto_activo = False # El jugador toma el control
+        if nueva_direccion and self.cliente:
+            self.cliente.encolar_giro(nueva_direccion) # Se aplica localmente sin esperar al servidor
+        elif nueva_direccion and self.motor.encolar_giro(nueva_direccion):
+            self.instantes_entrada.append(time.perf_counter())
+
+    def resumen_latencia(self):
+        """Retorna (p50, p99) en segundos de la latencia tecla -> movimiento, o None si no hay muestras."""
+        if not self.latencias:
+            return None
+        valores = sorted(self.latencias)
+        percentil = lambda p: valores[max(0, math.ceil(p * len(valores)) - 1)]
+        return percentil(0.50), percentil(0.99)
+
+
+# Función auxiliar para cargar el fondo animado
+def cargar_fondo_animado():
+    """Carga el fondo en movimiento (textura del tamaño de la ventana, cacheada en disco)."""
+    try:
+        return FondoDesplazable(FONDO_IMAGEN_RUTA, ANCHO_VENTANA, ALTURA_VENTANA, VELOCIDAD_FONDO)
+    except pygame.error:
+        print(f"ERROR: No se pudo cargar la imagen de fondo '{FONDO_IMAGEN_RUTA}'.")
+        return None # Retorna None si el archivo no se encuentra
+
+
+class EntradaGuionada:
+    """
+    Fuente de teclas para el modo benchmark: cada cierta cantidad de frames
+    publica un KEYDOWN de flecha elegido con una semilla fija, así el bucle
+    procesa eventos reales y todas las corridas son comparables.
+    """
+    def __init__(self, semilla=0, cada_frames=6):
+        self.rng = random.Random(semilla)
+        self.cada_frames = cada_frames
+        self.frame = 0
+
+    def publicar(self):
+        self.frame += 1
+        if self.frame % self.cada_frames == 0:
+            tecla = self.rng.choice(list(TECLAS_DIRECCION))
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=tecla))
+
+
+def dibujar_overlay_perfil(superficie, cache_texto, lineas):
+    """
+    Dibuja las líneas del perfil (p50/p99 por fase) en la esquina superior derecha.
+    Retorna la zona ocupada (la usa el renderizador de rects sucios).
+    """
+    zona = pygame.Rect(ANCHO_VENTANA - 10, 10, 0, 0)
+    y = 10
+    for linea in lineas:
+        caja = cache_texto.caja(linea)
+        zona.union_ip(superficie.blit(caja, (ANCHO_VENTANA - caja.get_width() - 10, y)))
+        y += caja.get_height() + 2
+    return zona
+
+
+def lineas_latencia(juego):
+    """Línea del overlay con la latencia de la entrada (vacía si todavía no se giró)."""
+    resumen = juego.resumen_latencia()
+    if resumen is None:
+        return []
+    p50, p99 = resumen
+    return [f"{'entrada':8} {p50 * 1000:5.1f} / {p99 * 1000:5.1f}"]
+
+
+def imprimir_benchmark(frames, frames_dibujados, ticks, duracion, tiempo_eventos, tiempo_logica, tiempo_dibujo,
+                       latencia=None):
+    """
+    Muestra el resumen del modo --bench. La lógica se mide por tick y el dibujo por
+    frame que dibujó algo (con rects sucios los frames sin cambios no cuentan).
+    """
+    print(f"Benchmark: {frames} frames ({frames_dibujados} con dibujo) y {ticks} ticks en {duracion:.2f} s")
+    if ticks:
+        print(f"  Lógica:  {tiempo_logica / ticks * 1e6:8.1f} µs por tick   (hasta {ticks / tiempo_logica:,.0f} ticks/s)")
+    if frames_dibujados:
+        print(f"  Dibujo:  {tiempo_dibujo / frames_dibujados * 1e6:8.1f} µs por frame  "
+              f"(hasta {frames_dibujados / tiempo_dibujo:,.0f} frames/s)")
+    print(f"  Eventos: {tiempo_eventos / frames * 1e6:8.1f} µs por frame")
+    if latencia:
+        print(f"  Latencia tecla -> movimiento: p50 {latencia[0] * 1000:.2f} ms, p99 {latencia[1] * 1000:.2f} ms")
 
 
 # =================================================================
-# 4. BUCLE PRINCIPAL DEL JUEGO (CicloJuego)
+# 3. BUCLE PRINCIPAL DEL JUEGO (CicloJuego)
 # =================================================================
-def principal():
-    juego = JuegoSerpiente() # Crea el objeto principal del juego
+def principal(bench_frames=None, ruta_csv_perfil=None, tablero=(ANCHO_TABLERO, ALTO_TABLERO), servidor=None,
+               piloto=False):
+    """
+    Bucle del juego. Con bench_frames (modo --bench) corre sin ventana real
+    (driver de video "dummy" de SDL), sin límite de FPS y con teclas guionadas,
+    y al final muestra el tiempo de lógica por tick y de dibujo por frame dibujado.
+    Cada frame se mide por fases; TECLA_PERFIL muestra p50/p99 en pantalla y con
+    ruta_csv_perfil los últimos FRAMES_PERFIL frames se guardan en CSV al salir.
+    tablero es (ancho, alto) en celdas; la ventana siempre mide ANCHO_VENTANA x ALTURA_VENTANA.
+    Con servidor=(host, puerto) se juega contra servidor_juego.py: tablero, semilla y
+    velocidad los elige el servidor y la serpiente se predice localmente.
+    Con piloto=True arranca jugando solo (TECLA_PILOTO lo activa o desactiva).
+    """
+    if bench_frames:
+        os.environ["SDL_VIDEODRIVER"] = "dummy" # Debe definirse antes de pygame.init()
+
+    # Inicializar Pygame (solo al jugar, importar el módulo no abre ventana)
+    pygame.init()
+    pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTURA_VENTANA)) # Crea la ventana
+    pygame.display.set_caption("Snake Clásico (Modo Teletransporte)") # Establece el título de la ventana
+    # Solo se encolan los eventos que el bucle usa (movimiento del mouse, etc. no llegan a la cola)
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE])
+    reloj = pygame.time.Clock() # Reloj para controlar el FPS
+
+    ticks_por_segundo = TICKS_POR_SEGUNDO
+    if servidor:
+        cliente = ClientePredictivo(*servidor)
+        juego = JuegoSerpiente(cliente.semilla, cliente.choque_cuerpo, cliente.ancho, cliente.alto)
+        juego.iniciar_red(cliente)
+        ticks_por_segundo = cliente.ticks_por_segundo # El reloj local sigue al del servidor
+    else:
+        juego = JuegoSerpiente(ancho=tablero[0], alto=tablero[1]) # Crea el objeto principal del juego
+    if piloto:
+        juego.alternar_piloto()
     ejecutando = True # Bandera para mantener el ciclo activo
 
+    # Perfil por fases (siempre activo: son unas pocas lecturas del reloj por frame)
+    perfil = PerfilFases(FASES_FRAME, FRAMES_PERFIL)
+    mostrar_perfil = False
+    texto_perfil = CacheTexto(22, BLANCO)
+    lineas_perfil = []
+
+    fondo_animado = cargar_fondo_animado() if USAR_FONDO_ANIMADO else None
+    renderizador = None
+    if MODO_RECTS_SUCIOS:
+        renderizador = RenderizadorRectsSucios(
+            pantalla, juego.tamano, GRIS,
+            lambda superficie, lineas: dibujar_overlay_perfil(superficie, texto_perfil, lineas))
+
+    # Paso fijo: la lógica avanza de a 1/TICKS_POR_SEGUNDO sin importar cuántos frames se dibujen
+    paso = 1.0 / ticks_por_segundo
+    acumulador = 0.0
+    instante_anterior = time.perf_counter()
+
+    # Modo benchmark: teclas guionadas y contadores de tiempo por fase
+    entrada_guionada = EntradaGuionada() if bench_frames and not piloto else None # Las flechas apagarían el piloto
+    frames = frames_dibujados = 0
+    tiempo_eventos = tiempo_logica = tiempo_dibujo = 0.0
+    inicio_bench = instante_anterior
+
     while ejecutando:
-        # 1. Procesamiento de Eventos (Entrada del usuario)
+        perfil.iniciar_frame() # No incluye la espera de reloj.tick del frame anterior
+        ahora = time.perf_counter()
+        if bench_frames:
+            # Tiempo simulado: cada frame cuenta como 1/FPS, así la proporción ticks/frames es la del juego real
+            transcurrido = 1.0 / FPS
+        else:
+            transcurrido = min(ahora - instante_anterior, paso * MAX_TICKS_POR_FRAME)
+        instante_anterior = ahora
+        acumulador += transcurrido
+
+        # 1. Procesamiento de Eventos (Entrada del usuario), una vez por frame
+        if entrada_guionada:
+            entrada_guionada.publicar()
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT:
                 ejecutando = False # Cierra si el usuario hace clic en X
+            elif evento.type == pygame.KEYDOWN and evento.key == TECLA_PERFIL:
+                mostrar_perfil = not mostrar_perfil
+                lineas_perfil = perfil.lineas_overlay() + lineas_latencia(juego)
+            elif evento.type == pygame.KEYDOWN and evento.key == TECLA_PILOTO:
+                juego.alternar_piloto()
             elif evento.type == pygame.KEYDOWN:
                 juego.manejar_entrada(evento.key) # Procesa la tecla presionada
-
-        # 2. Lógica del Juego (Actualización)
-        if not juego.mover_serpiente():#Mantiene el movimiento de la serpiente constante
-            ejecutando = False
+            elif evento.type == pygame.VIDEOEXPOSE and renderizador:
+                renderizador.invalidar() # La ventana se volvió a mostrar: repintar todo
+        if juego.cliente:
+            # Confirmaciones del servidor: si hubo que rebobinar, lo dibujado ya no vale
+            if juego.cliente.recibir() and renderizador:
+                renderizador.invalidar()
+            if juego.cliente.terminado:
+                ejecutando = False # El servidor terminó la partida o se cerró
+        fin_eventos = time.perf_counter()
+        perfil.marcar("eventos")
+
+        # 2. Lógica del Juego (Actualización): los ticks que correspondan al tiempo acumulado
+        while acumulador >= paso and ejecutando:
+            acumulador -= paso
+            if not juego.mover_serpiente():#Mantiene el movimiento de la serpiente constante
+                ejecutando = False # Chocó con su cuerpo (MODO_CHOQUE_CUERPO)
+        alfa = acumulador / paso if INTERPOLAR else None # Fracción del tick siguiente ya transcurrida
+        fin_logica = time.perf_counter()
+        perfil.marcar("logica")
 
         # 3. Dibujo (Renderizado)
-        pantalla.fill(GRIS) # Pinta el fondo
-        
-        juego.mecanicas_manzana.dibujar(pantalla) # Dibuja la manzana
-        juego.dibujar_serpiente(pantalla) # Dibuja la serpiente
-        juego.dibujar_puntuacion(pantalla) # Dibuja la puntuación
-        
-        pygame.display.flip() # Actualiza toda la pantalla para mostrar los dibujos
-
-        # 4. Control de Velocidad
-        reloj.tick(FPS) # Espera el tiempo necesario para cumplir con los FPS definidos
+        if renderizador and not fondo_animado:
+            # Solo actualiza las zonas que cambiaron (el overlay es una zona más)
+            dibujo = renderizador.dibujar(juego, alfa, perfil, lineas_perfil if mostrar_perfil else None)
+        else:
+            # Sin rects sucios o con el fondo en movimiento se repinta toda la pantalla
+            if fondo_animado:
+                fondo_animado.avanzar(transcurrido * ticks_por_segundo) # Misma velocidad que con 1 frame por tick
+                fondo_animado.dibujar(pantalla)
+            else:
+                pantalla.fill(GRIS) # Pinta el fondo
+            perfil.marcar("fondo")
+            juego.dibujar_tablero(pantalla, alfa)
+            perfil.marcar("escena")
+            juego.dibujar_puntuacion(pantalla)
+            if mostrar_perfil:
+                dibujar_overlay_perfil(pantalla, texto_perfil, lineas_perfil)
+            perfil.marcar("hud")
+            pygame.display.flip() # Actualiza toda la pantalla para mostrar los dibujos
+            perfil.marcar("flip")
+            dibujo = True
+        perfil.cerrar_frame()
+        if mostrar_perfil and perfil.frames % FRAMES_ENTRE_PERCENTILES == 0:
+            lineas_perfil = perfil.lineas_overlay() + lineas_latencia(juego)
+
+        # 4. Control de Velocidad (solo del dibujo; la lógica la controla el acumulador)
+        if bench_frames:
+            # Sin límite de FPS: solo se mide
+            fin_dibujo = time.perf_counter()
+            tiempo_eventos += fin_eventos - ahora
+            tiempo_logica += fin_logica - fin_eventos
+            if dibujo: # Los frames que no tenían nada que dibujar no cuentan como dibujo
+                tiempo_dibujo += fin_dibujo - fin_logica
+                frames_dibujados += 1
+            frames += 1
+            if frames >= bench_frames:
+                ejecutando = False
+        else:
+            reloj.tick(FPS)
 
     # 5. Salida del Juego
+    if bench_frames:
+        imprimir_benchmark(frames, frames_dibujados, juego.motor.ticks, time.perf_counter() - inicio_bench,
+                           tiempo_eventos, tiempo_logica, tiempo_dibujo, juego.resumen_latencia())
+    if juego.grabador:
+        juego.grabador.guardar(RUTA_GRABACION)
+    if ruta_csv_perfil:
+        perfil.guardar_csv(ruta_csv_perfil)
+    if juego.cliente:
+        print(f"Rebobinados por giros que llegaron tarde al servidor: {juego.cliente.rebobinados}")
+        juego.cliente.cerrar()
     pygame.quit()
     sys.exit()
 
 if __name__ == '__main__':
-    principal()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Snake Clásico (Modo Teletransporte)")
+    parser.add_argument("--bench", type=int, nargs="?", const=5000, metavar="FRAMES",
+                        help="corre sin ventana ni límite de FPS y mide el rendimiento (5000 frames por defecto)")
+    parser.add_argument("--perfil-csv", metavar="RUTA",
+                        help="al salir guarda en CSV el tiempo de cada fase de los últimos frames")
+    parser.add_argument("--tablero", default=f"{ANCHO_TABLERO}x{ALTO_TABLERO}", metavar="ANCHOxALTO",
+                        help="tamaño del tablero en celdas, independiente de la ventana (por defecto %(default)s)")
+    parser.add_argument("--servidor", metavar="HOST:PUERTO",
+                        help="juega contra servidor_juego.py con predicción local de la serpiente")
+    parser.add_argument("--piloto", action="store_true",
+                        help="arranca con el piloto automático (modo demostración)")
+    argumentos = parser.parse_args()
+    tablero = tuple(int(n) for n in argumentos.tablero.lower().split("x"))
+    servidor = None
+    if argumentos.servidor:
+        host, _, puerto = argumentos.servidor.rpartition(":")
+        servidor = (host or "127.0.0.1", int(puerto))
+    principal(argumentos.bench, argumentos.perfil_csv, tablero, servidor, argumentos.piloto)
\ No newline at end of file
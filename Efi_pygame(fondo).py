@@ -2,6 +2,8 @@ import pygame
 import random
 import sys
 
+from render_serpiente import FondoDesplazable
+
 # =================================================================
 # 1. CONFIGURACIÓN INICIAL DE PYGAME Y CONSTANTES DEL JUEGO
 # =================================================================
@@ -258,14 +260,15 @@ class JuegoSerpiente:
         if nueva_direccion:
             self.direccion_actual = nueva_direccion # Aplica la nueva dirección
 
-# Función auxiliar para cargar y escalar el fondo animado
+# Función auxiliar para cargar el fondo animado
 def cargar_fondo_animado():
-    """Carga y escala la imagen de fondo para que ocupe la ventana y permita el desplazamiento."""
+    """
+    Carga la imagen de fondo para que ocupe la ventana y permita el desplazamiento.
+    MEJORA: una sola textura del tamaño de la ventana (antes el doble de ancho),
+    guardada ya convertida y escalada en disco para que el próximo arranque sea inmediato.
+    """
     try:
-        imagen = pygame.image.load(FONDO_IMAGEN_RUTA).convert() # .convert() para optimizar para la pantalla
-        # Escalamos el ancho al doble de la ventana para permitir el efecto de wrapping
-        imagen_escalada = pygame.transform.scale(imagen, (ANCHO_VENTANA * 2, ALTURA_VENTANA))
-        return imagen_escalada
+        return FondoDesplazable(FONDO_IMAGEN_RUTA, ANCHO_VENTANA, ALTURA_VENTANA, VELOCIDAD_FONDO)
     except pygame.error:
         print(f"ERROR: No se pudo cargar la imagen de fondo '{FONDO_IMAGEN_RUTA}'. "
               "Asegúrate de que el archivo exista en el mismo directorio que el script.")
@@ -279,7 +282,6 @@ def principal():
     ejecutando = True # Bandera para mantener el ciclo activo
 
     fondo_animado = cargar_fondo_animado() # 🐛 Carga la imagen de fondo una vez
-    pos_fondo_x = 0 # 🐛 Inicializa la posición X del fondo
 
     while ejecutando:
         # 1. Procesamiento de Eventos (Entrada del usuario)
@@ -297,19 +299,9 @@ def principal():
         # 🐛 DIBUJO DEL FONDO ANIMADO 🐛
         if fondo_animado:
             # Mueve el fondo a la izquierda. Ajusta VELOCIDAD_FONDO para cambiar la rapidez.
-            pos_fondo_x -= VELOCIDAD_FONDO 
-            
-            # Si el fondo se ha desplazado completamente fuera de la pantalla (su ancho es ANCHO_VENTANA * 2),
-            # lo reseteamos a 0 para el efecto de desplazamiento continuo.
-            # Cuando pos_fondo_x llega a -ANCHO_VENTANA, significa que la primera copia ha salido y la segunda está visible.
-            if pos_fondo_x <= -ANCHO_VENTANA:
-                pos_fondo_x = 0
-
-            # Dibuja la imagen de fondo dos veces para el efecto de "wrapping"
-            # La primera en su posición actual.
-            pantalla.blit(fondo_animado, (pos_fondo_x, 0))
-            # La segunda justo después de la primera, para rellenar el espacio que se está desocupando.
-            pantalla.blit(fondo_animado, (pos_fondo_x + ANCHO_VENTANA, 0))
+            fondo_animado.avanzar()
+            # Copia solo las dos franjas visibles: la que se va por la izquierda y la que entra por la derecha
+            fondo_animado.dibujar(pantalla)
         else:
             # Fallback: Si no se pudo cargar la imagen, usa un color sólido
             pantalla.fill(GRIS) 
@@ -3,6 +3,8 @@ import random
 import sys
 import time  # Para el cronómetro
 
+from render_serpiente import CacheTexto, FondoDesplazable
+
 # =================================================================
 # 1. CONFIGURACIÓN INICIAL DE PYGAME Y CONSTANTES DEL JUEGO
 # =================================================================
@@ -109,6 +111,7 @@ class JuegoSerpiente:
         self.direccion_actual = DIRECCION_INICIAL
 
         self.tiempo_inicio = time.time()  # ⏱ Guardamos el tiempo de inicio del cronómetro
+        self.cache_texto = CacheTexto(36, BLANCO)  # Fuente cargada una vez; puntuación y tiempo se re-renderizan solo al cambiar
 
     def cargar_imagen_serpiente(self):
         ruta_imagen = "cabeza_serpiente.png"
@@ -119,22 +122,15 @@ class JuegoSerpiente:
             return None
 
     def dibujar_puntuacion(self, superficie):
-        fuente = pygame.font.Font(None, 36)
-        texto = fuente.render(f"Puntuación: {self.puntuacion}", True, BLANCO)
-        fondo_texto = pygame.Rect(10, 10, texto.get_width() + 10, texto.get_height() + 10)
-        pygame.draw.rect(superficie, (51, 51, 51), fondo_texto, border_radius=5)
-        superficie.blit(texto, (15, 15))
+        superficie.blit(self.cache_texto.caja(f"Puntuación: {self.puntuacion}"), (10, 10))
 
     # ================= CRONÓMETRO =================
     def dibujar_cronometro(self, superficie):
         """Dibuja el tiempo restante (10s) en pantalla"""
         tiempo_transcurrido = int(time.time() - self.tiempo_inicio)
         tiempo_restante = max(TIEMPO_MAXIMO - tiempo_transcurrido, 0)  # Evita negativos
-        fuente = pygame.font.Font(None, 36)
-        texto = fuente.render(f"Tiempo: {tiempo_restante}s", True, BLANCO)
-        fondo_texto = pygame.Rect(ANCHO_VENTANA - texto.get_width() - 20, 10, texto.get_width() + 10, texto.get_height() + 10)
-        pygame.draw.rect(superficie, (51, 51, 51), fondo_texto, border_radius=5)
-        superficie.blit(texto, (ANCHO_VENTANA - texto.get_width() - 15, 15))
+        caja = self.cache_texto.caja(f"Tiempo: {tiempo_restante}s")  # Solo se renderiza cuando cambia el segundo
+        superficie.blit(caja, (ANCHO_VENTANA - caja.get_width() - 10, 10))
         return tiempo_restante  # Retorna para chequear fin de juego
 
     def dibujar_serpiente(self, superficie):
@@ -190,8 +186,7 @@ class JuegoSerpiente:
 # =================================================================
 def cargar_fondo_animado():
     try:
-        imagen = pygame.image.load(FONDO_IMAGEN_RUTA).convert()
-        return pygame.transform.scale(imagen, (ANCHO_VENTANA * 2, ALTURA_VENTANA))
+        return FondoDesplazable(FONDO_IMAGEN_RUTA, ANCHO_VENTANA, ALTURA_VENTANA, VELOCIDAD_FONDO)
     except pygame.error:
         print(f"ERROR: No se pudo cargar la imagen de fondo '{FONDO_IMAGEN_RUTA}'.")
         return None
@@ -203,7 +198,6 @@ def principal():
     juego = JuegoSerpiente()
     ejecutando = True
     fondo_animado = cargar_fondo_animado()
-    pos_fondo_x = 0
 
     while ejecutando:
         for evento in pygame.event.get():
@@ -216,11 +210,8 @@ def principal():
             ejecutando = False
 
         if fondo_animado:
-            pos_fondo_x -= VELOCIDAD_FONDO
-            if pos_fondo_x <= -ANCHO_VENTANA:
-                pos_fondo_x = 0
-            pantalla.blit(fondo_animado, (pos_fondo_x, 0))
-            pantalla.blit(fondo_animado, (pos_fondo_x + ANCHO_VENTANA, 0))
+            fondo_animado.avanzar()
+            fondo_animado.dibujar(pantalla)
         else:
             pantalla.fill(GRIS)
 
@@ -1,6 +1,10 @@
+import argparse
+import os
 import pygame
 import random
 import sys
+import time
+from collections import deque
 
 # --- 1. CONSTANTES DEL JUEGO ---
 # Dimensiones de la ventana (basadas en el código original de 800x500)
@@ -20,6 +24,17 @@ COLOR_TEXT = (51, 51, 51)           # Gris oscuro (similar a #333)
 # Velocidad del juego (FPS o Ticks por segundo)
 GAME_SPEED = 10 # 10 actualizaciones por segundo (similar a 75ms/tick)
 
+# Modo clásico: chocar con el propio cuerpo termina el juego (desactivado por defecto)
+SELF_COLLISION = False
+
+# Modo --bench: cada cuántos frames se simula una flecha (semilla fija, siempre la misma partida)
+BENCH_FRAMES_PER_KEY = 7
+BENCH_SEED = 0
+
+# Cuadrícula en celdas (para la grilla de ocupación de la serpiente)
+GRID_COLS = WINDOW_WIDTH // BLOCK_SIZE
+GRID_ROWS = WINDOW_HEIGHT // BLOCK_SIZE
+
 # --- 2. CLASE COMIDA (FOOD) ---
 class Food:
     """Maneja la posición aleatoria y el dibujo de la comida."""
@@ -50,14 +65,17 @@ class Snake:
     """Maneja el movimiento, el cuerpo y las colisiones de la serpiente."""
     def __init__(self, surface):
         self.surface = surface
-        self.body = []
+        # deque: appendleft() y pop() son O(1), insert(0, ...) en una lista desplazaba todo el cuerpo
+        self.body = deque()
+        # Segmentos por celda de la cuadrícula, para saber en O(1) si una celda está ocupada
+        self.occupancy = [0] * (GRID_COLS * GRID_ROWS)
         
         # Posición inicial al centro (alineada a la cuadrícula)
         start_x = (WINDOW_WIDTH // 2) // BLOCK_SIZE * BLOCK_SIZE
         start_y = (WINDOW_HEIGHT // 2) // BLOCK_SIZE * BLOCK_SIZE
         
         # El cuerpo inicial es solo la cabeza
-        self.body.append(pygame.Rect(start_x, start_y, BLOCK_SIZE, BLOCK_SIZE))
+        self._push_head(pygame.Rect(start_x, start_y, BLOCK_SIZE, BLOCK_SIZE))
         
         # Dirección inicial (Derecha por defecto)
         self.direction = (BLOCK_SIZE, 0) # (dx, dy)
@@ -97,15 +115,45 @@ class Snake:
         new_head = pygame.Rect(new_x, new_y, BLOCK_SIZE, BLOCK_SIZE)
         
         # 2. Insertar la nueva cabeza y eliminar la cola (a menos que haya comido)
-        self.body.insert(0, new_head)
-        self.body.pop() # Elimina el último segmento (la cola)
+        self._push_head(new_head)
+        self._pop_tail() # Elimina el último segmento (la cola)
 
     def grow(self):
         """Agrega un nuevo segmento al final del cuerpo."""
+        # El cuerpo nunca supera el área del tablero, así la memoria queda acotada
+        if len(self.body) >= GRID_COLS * GRID_ROWS:
+            return
         # Simplemente insertamos una copia del último segmento. 
         # La próxima llamada a move() lo moverá al lugar correcto.
         tail = self.body[-1]
         self.body.append(tail) 
+        self.occupancy[self._cell(tail)] += 1
+
+    def check_self_collision(self):
+        """
+        Retorna True si la cabeza comparte celda con otro segmento.
+        Se llama después de move() y antes de grow(): la cola ya se quitó y todavía
+        no está la copia que agrega grow(), así que basta con mirar el contador de
+        la celda de la cabeza (O(1), sin recorrer el cuerpo).
+        """
+        return self.occupancy[self._cell(self.body[0])] > 1
+
+    def is_occupied(self, x, y):
+        """Retorna si algún segmento ocupa la celda de la posición en píxeles (x, y), en O(1)."""
+        return self.occupancy[(y // BLOCK_SIZE) * GRID_COLS + x // BLOCK_SIZE] > 0
+
+    def _cell(self, rect):
+        """Índice plano de la celda de un segmento."""
+        return (rect.top // BLOCK_SIZE) * GRID_COLS + rect.left // BLOCK_SIZE
+
+    def _push_head(self, rect):
+        self.body.appendleft(rect)
+        self.occupancy[self._cell(rect)] += 1
+
+    def _pop_tail(self):
+        tail = self.body.pop()
+        self.occupancy[self._cell(tail)] -= 1
+        return tail
 
     
     def draw(self):
@@ -116,8 +164,22 @@ class Snake:
 
 
 # --- 4. FUNCIÓN PRINCIPAL DEL JUEGO ---
-def game_loop():
-    """Inicializa Pygame y ejecuta el bucle principal del juego."""
+def print_benchmark(frames, duration, logic_time, draw_time):
+    """Muestra el resumen del modo --bench (aquí cada frame es un tick y siempre dibuja)."""
+    print(f"Benchmark: {frames} frames/ticks en {duration:.2f} s")
+    print(f"  Lógica:  {logic_time / frames * 1e6:8.1f} µs por tick   (hasta {frames / logic_time:,.0f} ticks/s)")
+    print(f"  Dibujo:  {draw_time / frames * 1e6:8.1f} µs por frame  (hasta {frames / draw_time:,.0f} frames/s)")
+
+
+def game_loop(bench_frames=None):
+    """
+    Inicializa Pygame y ejecuta el bucle principal del juego.
+    Con bench_frames (modo --bench) corre sin ventana real ni límite de velocidad,
+    con flechas simuladas, y al final muestra el tiempo de lógica y de dibujo.
+    """
+    if bench_frames:
+        os.environ["SDL_VIDEODRIVER"] = "dummy" # Debe definirse antes de pygame.init()
+        random.seed(BENCH_SEED)
     pygame.init()
     
     # Configuración de la pantalla
@@ -134,14 +196,24 @@ def game_loop():
     snake = Snake(screen)
     food = Food(screen)
     score = 0
-    # Como ya no hay colisiones, el juego nunca termina (game_over siempre es False)
+    # Sin SELF_COLLISION no hay colisiones y el juego nunca termina (game_over siempre es False)
     game_over = False 
 
+    # Modo benchmark: flechas simuladas y tiempos acumulados
+    bench_keys = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+    frames = 0
+    logic_time = draw_time = 0.0
+    bench_start = time.perf_counter()
+
     # --- BUCLE PRINCIPAL DEL JUEGO (GAME LOOP) ---
     running = True
     while running:
-        # Controlar la velocidad de actualización
-        clock.tick(GAME_SPEED)
+        # Controlar la velocidad de actualización (en --bench sin límite: solo se mide)
+        if bench_frames:
+            if frames % BENCH_FRAMES_PER_KEY == 0:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=random.choice(bench_keys)))
+        else:
+            clock.tick(GAME_SPEED)
         
         # --- Manejo de Eventos (Input) ---
         for event in pygame.event.get():
@@ -160,25 +232,29 @@ def game_loop():
                     snake.change_direction((BLOCK_SIZE, 0))
                 # El reinicio por ESPACIO ya no es necesario, pero se mantiene la lógica si game_over fuera True por error
                 elif event.key == pygame.K_SPACE and game_over: 
-                    game_loop() # Reinicia la función principal
+                    game_loop(bench_frames) # Reinicia la función principal
                     return # Sale de la función actual
 
         # --- Lógica de Juego (Solo si no ha terminado) ---
+        logic_start = time.perf_counter()
         if not game_over:
             snake.move()
 
-            # 1. Colisión con la comida
-            if snake.body[0].colliderect(food.rect):
+            # 1. Colisión consigo misma: solo en modo clásico (SELF_COLLISION).
+            # Va antes de grow(): la copia de la cola que agrega grow() comparte
+            # celda con la cola, y con largo 1 la cola es la cabeza.
+            if SELF_COLLISION and snake.check_self_collision():
+                game_over = True
+                print("GAME OVER: ¡Colisión consigo mismo!")
+
+            # 2. Colisión con la comida
+            elif snake.body[0].colliderect(food.rect):
                 score += 1
                 snake.grow()
                 food.randomize_position()
-                
-            # 2. Colisión consigo misma: LÓGICA ELIMINADA. El juego no termina.
-            # if snake.check_self_collision():
-            #     game_over = True
-            #     print("GAME OVER: ¡Colisión consigo mismo!")
 
         # --- Renderizado (Dibujo) ---
+        draw_start = time.perf_counter()
         screen.fill(COLOR_BACKGROUND)
         
         # Dibujar objetos
@@ -198,9 +274,21 @@ def game_loop():
         # Actualizar la pantalla completa
         pygame.display.flip()
 
+        if bench_frames:
+            logic_time += draw_start - logic_start
+            draw_time += time.perf_counter() - draw_start
+            frames += 1
+            if frames >= bench_frames:
+                running = False
+
     # --- Finalización del juego ---
+    if bench_frames:
+        print_benchmark(frames, time.perf_counter() - bench_start, logic_time, draw_time)
     pygame.quit()
     sys.exit()
 
 if __name__ == '__main__':
-    game_loop()
+    parser = argparse.ArgumentParser(description="Snake Wrapping (Pygame)")
+    parser.add_argument("--bench", type=int, nargs="?", const=5000, metavar="FRAMES",
+                        help="corre sin ventana ni límite de velocidad y mide el rendimiento (5000 frames por defecto)")
+    game_loop(parser.parse_args().bench)
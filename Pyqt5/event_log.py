@@ -0,0 +1,125 @@
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+# =================================================================
+# REGISTRO DE EVENTOS (EventLog)
+# Reemplaza los print() de cada tick: escribir a stdout en el mismo
+# hilo del juego (y más si la salida va por un pipe al colector de
+# logs) se comía el tick. Los eventos se filtran por nivel, se guardan
+# en un buffer circular (historial en memoria) y un hilo aparte los
+# escribe en lotes. Con DEBUG apagado el tick solo paga un if:
+#
+#     if log.debug_enabled:
+#         log.debug("collision_check", snake=(x, y), apple=(ax, ay))
+#
+# El nivel inicial se toma de la variable de entorno SNAKE_LOG_LEVEL.
+# =================================================================
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+_STOP = object() # Marca para que el hilo escritor termine
+
+
+class EventLog:
+    """
+    Structured event log: each record is (timestamp, level, event, fields).
+    Records below `level` are dropped before any formatting happens.
+    """
+    def __init__(self, level=INFO, history=1000, stream=None):
+        self.history = deque(maxlen=history) # Last records, for in-game inspection or crash dumps
+        self.stream = stream
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._lock = threading.Lock()
+        self.set_level(level)
+        atexit.register(self.close) # Pending records are written before the program exits
+
+    def set_level(self, level):
+        self.level = level
+        self.debug_enabled = level <= DEBUG # Checked by the hot path before building any arguments
+
+    def log(self, level, event, **fields):
+        if level < self.level:
+            return
+        record = (time.time(), level, event, fields)
+        self.history.append(record)
+        if self._writer is None:
+            self._start_writer()
+        self._queue.put(record)
+
+    def debug(self, event, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        self.log(ERROR, event, **fields)
+
+    # --- Background writer ---
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        """Waits for records and writes every record already queued in a single write()."""
+        while True:
+            record = self._queue.get()
+            batch = []
+            while True:
+                if record is _STOP:
+                    self._write(batch)
+                    return
+                batch.append(format_record(record))
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, lines):
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("\n".join(lines) + "\n")
+        stream.flush()
+
+    def close(self):
+        """Writes whatever is pending and stops the writer thread."""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+        self._writer = None
+
+
+def format_record(record):
+    timestamp, level, event, fields = record
+    millis = int(timestamp * 1000) % 1000
+    text = f"{time.strftime('%H:%M:%S', time.localtime(timestamp))}.{millis:03d} {LEVEL_NAMES.get(level, level)} {event}"
+    if fields:
+        text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+    return text
+
+
+def _level_from_env():
+    name = os.environ.get("SNAKE_LOG_LEVEL", "INFO").upper()
+    return {v: k for k, v in LEVEL_NAMES.items()}.get(name, INFO)
+
+
+# Shared log for the PyQt5 front-end
+log = EventLog(_level_from_env())
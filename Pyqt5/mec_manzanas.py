@@ -1,16 +1,15 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QLabel 
-from PyQt5.QtCore import Qt
 import random
 
+from event_log import log
+
 # =================================================================
 # CLASE 1: MECÁNICAS DE LA MANZANA (Apple Mechanics)
 # Encapsula la lógica de posicionamiento aleatorio de la manzana.
 # =================================================================
 class AppleMechanics:
-    def __init__(self, canvas, apple_label, movement_step, window_width, window_height, label_size):
-        self.apple_label = apple_label
-        self.canvas = canvas
+    def __init__(self, canvas, movement_step, window_width, window_height, label_size):
+        self.canvas = canvas # SnakeCanvas that draws the apple
         self.MOVEMENT_STEP = movement_step
         self.WINDOW_WIDTH = window_width
         self.WINDOW_HEIGHT = window_height
@@ -23,7 +22,7 @@ class AppleMechanics:
         
     def place_random_apple(self):
         """
-        Places the apple widget in a random position 
+        Places the apple in a random position 
         within the canvas limits, ensuring alignment with the movement grid.
         """
         # Calculate the maximum limits for the X and Y coordinates (adjusted by the label size)
@@ -37,14 +36,14 @@ class AppleMechanics:
         rand_x = rand_x_steps * self.MOVEMENT_STEP
         rand_y = rand_y_steps * self.MOVEMENT_STEP
         
-        # Move the apple to the new random position
-        self.apple_label.move(rand_x, rand_y)
+        # Move the apple to the new random position (the canvas repaints only the old and new spots)
+        self.canvas.set_apple(rand_x, rand_y)
         
         # STORE the apple's position for collision detection
         self.apple_x = rand_x
         self.apple_y = rand_y
         
-        print(f"🍏 New Apple at: ({rand_x}, {rand_y})")
+        log.info("apple_placed", x=rand_x, y=rand_y)
 
     def get_coords(self):
         """Returns the current absolute coordinates of the apple."""
@@ -1,3 +1,11 @@
+import sys
+from PyQt5.QtWidgets import QApplication, QMainWindow
+from PyQt5.QtCore import Qt
+
+from event_log import log
+from mec_manzanas import AppleMechanics
+from snake_canvas import SnakeCanvas
+
 # =================================================================
 # CLASE 2: VENTANA PRINCIPAL (Snake Mechanics & Game Core)
 # Gestiona el movimiento de la serpiente, la puntuación y la colisión.
@@ -27,38 +35,26 @@ class MainWindow(QMainWindow):
         self.current_x = (center_x // self.MOVEMENT_STEP) * self.MOVEMENT_STEP
         self.current_y = (center_y // self.MOVEMENT_STEP) * self.MOVEMENT_STEP
 
-        # 1. Main Canvas Widget (No Layout)
-        self.canvas = QWidget() 
+        # 1. Main Canvas Widget: draws snake, apple and score with QPainter (no QLabels)
+        self.canvas = SnakeCanvas(self.LABEL_SIZE)
         self.setCentralWidget(self.canvas)
-        self.canvas.setStyleSheet("background-color: #f0f0f0;") 
 
-        # 2. Create the Snake (QLabel)
-        self.snake_label = QLabel("🐍", self.canvas) 
-        self.snake_label.setStyleSheet("font-size: 80px;")
-        self.snake_label.move(self.current_x, self.current_y)
-        self.snake_label.show() 
-        
-        # 3. Create the Apple (QLabel)
-        self.apple_label = QLabel("🍎", self.canvas) 
-        self.apple_label.setStyleSheet("font-size: 80px;")
-        self.apple_label.show()
+        # 2. Snake segments in pixels, head first (the canvas supports any length)
+        self.segments = [(self.current_x, self.current_y)]
+        self.canvas.set_snake(self.segments)
         
         # ⭐️ INSTANCIACIÓN DE MECÁNICAS SEPARADAS
         self.apple_mechanics = AppleMechanics(
             self.canvas,
-            self.apple_label,
             self.MOVEMENT_STEP,
             self.WINDOW_WIDTH,
             self.WINDOW_HEIGHT,
             self.LABEL_SIZE
         )
         
-        # 4. Initialize the Counter and Score Label
+        # 3. Initialize the Counter (drawn by the canvas in the top left corner)
         self.score = 0
-        self.score_label = QLabel(f"Puntuación: {self.score}", self.canvas)
-        self.score_label.setStyleSheet("font-size: 24px; color: white; background-color: #333; padding: 5px; border-radius: 5px;")
-        self.score_label.move(10, 10) # Position in the top left corner
-        self.score_label.show()
+        self.canvas.set_score(self.score)
         
     def set_window_size(self, width, height, pos_x=100, pos_y=100):
         """Sets the size (width and height) and initial position of the window."""
@@ -76,7 +72,7 @@ class MainWindow(QMainWindow):
         is_y_valid = (next_y >= 0) and (next_y <= self.WINDOW_HEIGHT - self.LABEL_SIZE)
         
         if not is_x_valid or not is_y_valid:
-            print("❌ INVALID MOVEMENT: Window limit reached.")
+            log.warning("invalid_movement", x=next_x, y=next_y, reason="window limit")
             return False
         
         return True
@@ -89,14 +85,15 @@ class MainWindow(QMainWindow):
         """
         apple_x, apple_y = self.apple_mechanics.get_coords()
         
-        # ⭐️ DEBUG: Print coordinates being compared
-        print(f"➡️ Checking collision: Snake at ({self.current_x}, {self.current_y}) vs Apple at ({apple_x}, {apple_y})")
+        # ⭐️ DEBUG: Log coordinates being compared (only built when debug logging is on)
+        if log.debug_enabled:
+            log.debug("collision_check", snake=(self.current_x, self.current_y), apple=(apple_x, apple_y))
         
         # Check if the coordinates of the snake (current) and the apple (apple_x/y) are equal
         if self.current_x == apple_x and self.current_y == apple_y:
             self.score += 1
-            self.score_label.setText(f"Puntuación: {self.score}")
-            print(f"🎉 COLLISION! Current score: {self.score}")
+            self.canvas.set_score(self.score)
+            log.info("apple_eaten", score=self.score)
             
             # Use the method from the separate mechanics class
             self.apple_mechanics.place_random_apple()
@@ -109,13 +106,15 @@ class MainWindow(QMainWindow):
         self.current_x = new_x
         self.current_y = new_y
         
-        # Visually move the QLabel to the new position
-        self.snake_label.move(new_x, new_y) 
+        # Visually move the snake (only the old and new cells are repainted)
+        self.segments[0] = (new_x, new_y)
+        self.canvas.set_snake(self.segments)
         
         # After moving the snake, check for collision
         self.check_collision_and_score()
         
-        print(f"✅ Valid Movement: Snake moved to ({new_x}, {new_y})")
+        if log.debug_enabled:
+            log.debug("snake_moved", x=new_x, y=new_y)
         
     def keyPressEvent(self, event):
         """
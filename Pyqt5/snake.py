@@ -1,16 +1,25 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QLabel 
+import time
+from collections import deque
+from PyQt5.QtWidgets import QApplication, QMainWindow
 from PyQt5.QtCore import Qt, QTimer
 import random
 
+from event_log import log
+from snake_canvas import SnakeCanvas
+
+# Arrow key -> the key that would reverse it
+OPPOSITE_KEYS = {Qt.Key_Up: Qt.Key_Down, Qt.Key_Down: Qt.Key_Up, Qt.Key_Left: Qt.Key_Right, Qt.Key_Right: Qt.Key_Left}
+MAX_QUEUED_TURNS = 3 # Turns that can be pressed ahead between two ticks
+LATENCY_SAMPLES = 256 # Last key -> move latencies kept for tuning
+
 # =================================================================
 # CLASS 1: APPLE MECHANICS
 # Encapsulates the random positioning logic for the apple.
 # =================================================================
 class AppleMechanics:
-    def __init__(self, canvas, apple_label, movement_step, window_width, window_height, label_size):
-        self.apple_label = apple_label
-        self.canvas = canvas
+    def __init__(self, canvas, movement_step, window_width, window_height, label_size):
+        self.canvas = canvas # SnakeCanvas that draws the apple
         self.MOVEMENT_STEP = movement_step
         self.WINDOW_WIDTH = window_width
         self.WINDOW_HEIGHT = window_height
@@ -23,7 +32,7 @@ class AppleMechanics:
         
     def place_random_apple(self):
         """
-        Places the apple widget in a random position 
+        Places the apple in a random position 
         within the canvas limits, ensuring alignment with the movement grid.
         """
         # Calculate the maximum limits for the X and Y coordinates (adjusted by the label size)
@@ -37,14 +46,14 @@ class AppleMechanics:
         rand_x = rand_x_steps * self.MOVEMENT_STEP
         rand_y = rand_y_steps * self.MOVEMENT_STEP
         
-        # Move the apple to the new random position
-        self.apple_label.move(rand_x, rand_y)
+        # Move the apple to the new random position (the canvas repaints only the old and new spots)
+        self.canvas.set_apple(rand_x, rand_y)
         
         # STORE the apple's position for collision detection
         self.apple_x = rand_x
         self.apple_y = rand_y
         
-        print(f"🍏 New Apple at: ({rand_x}, {rand_y})")
+        log.info("apple_placed", x=rand_x, y=rand_y)
 
     def get_coords(self):
         """Returns the current absolute coordinates of the apple."""
@@ -79,42 +88,32 @@ class MainWindow(QMainWindow):
         self.current_x = (center_x // self.MOVEMENT_STEP) * self.MOVEMENT_STEP
         self.current_y = (center_y // self.MOVEMENT_STEP) * self.MOVEMENT_STEP
 
-        # 1. Main Canvas Widget (No Layout)
-        self.canvas = QWidget() 
+        # 1. Main Canvas Widget: draws snake, apple and score with QPainter (no QLabels)
+        self.canvas = SnakeCanvas(self.LABEL_SIZE)
         self.setCentralWidget(self.canvas)
-        self.canvas.setStyleSheet("background-color: #f0f0f0;") 
 
-        # 2. Create the Snake (QLabel)
-        self.snake_label = QLabel("🐍", self.canvas) 
-        self.snake_label.setStyleSheet("font-size: 80px;")
-        self.snake_label.move(self.current_x, self.current_y)
-        self.snake_label.show() 
-        
-        # 3. Create the Apple (QLabel)
-        self.apple_label = QLabel("🍎", self.canvas) 
-        self.apple_label.setStyleSheet("font-size: 80px;")
-        self.apple_label.show()
+        # 2. Snake segments in pixels, head first (the canvas supports any length)
+        self.segments = [(self.current_x, self.current_y)]
+        self.canvas.set_snake(self.segments)
         
         # ⭐️ INSTANTIATION OF SEPARATE MECHANICS
         self.apple_mechanics = AppleMechanics(
             self.canvas,
-            self.apple_label,
             self.MOVEMENT_STEP,
             self.WINDOW_WIDTH,
             self.WINDOW_HEIGHT,
             self.LABEL_SIZE
         )
         
-        # 4. Initialize the Counter and Score Label
+        # 3. Initialize the Counter (drawn by the canvas in the top left corner)
         self.score = 0
-        self.score_label = QLabel(f"Puntuación: {self.score}", self.canvas)
-        self.score_label.setStyleSheet("font-size: 24px; color: white; background-color: #333; padding: 5px; border-radius: 5px;")
-        self.score_label.move(10, 10) # Position in the top left corner
-        self.score_label.show()
+        self.canvas.set_score(self.score)
 
         # ⭐️ QTIMER CONFIGURATION FOR CONTINUOUS MOVEMENT
         # Set initial direction to RIGHT so the snake moves immediately
         self.direction = Qt.Key_Right 
+        self.pending_turns = deque() # (key, press time) validated turns waiting for their tick, one per tick
+        self.input_latencies = deque(maxlen=LATENCY_SAMPLES) # Seconds from key press to the tick that applied it
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.move_snake_auto)
         self.timer.start(150) # Interval in ms (adjust to change speed)
@@ -132,6 +131,13 @@ class MainWindow(QMainWindow):
         if self.direction is None:
             return
 
+        # Apply at most one queued turn per tick
+        if self.pending_turns:
+            self.direction, pressed_at = self.pending_turns.popleft()
+            self.input_latencies.append(time.perf_counter() - pressed_at)
+            if log.debug_enabled:
+                log.debug("turn_applied", key=self.direction, latency_ms=round(self.input_latencies[-1] * 1000, 2))
+
         next_x = self.current_x
         next_y = self.current_y
 
@@ -145,13 +151,8 @@ class MainWindow(QMainWindow):
         elif self.direction == Qt.Key_Right:
             next_x += self.MOVEMENT_STEP
 
-        # 2. Check limits and move
-        #if self.limit_check(next_x, next_y):
-        self.receive_movement_coords(next_x%800, next_y%500)
-        else:
-            print("GAME OVER: ¡Límite alcanzado!")
-            # If the game should end upon collision, uncomment:
-            # self.timer.stop() 
+        # 2. Move (teleport mode: crossing an edge wraps around, so there is no limit check)
+        self.receive_movement_coords(next_x % self.WINDOW_WIDTH, next_y % self.WINDOW_HEIGHT)
 
 
     # FUNCTION TO CHECK LIMITS
@@ -166,7 +167,7 @@ class MainWindow(QMainWindow):
         is_y_valid = (next_y >= 0) and (next_y <= self.WINDOW_HEIGHT - self.LABEL_SIZE)
         
         if not is_x_valid or not is_y_valid:
-            print("❌ INVALID MOVEMENT: Window limit reached.")
+            log.warning("invalid_movement", x=next_x, y=next_y, reason="window limit")
             return False
         
         return True
@@ -179,14 +180,15 @@ class MainWindow(QMainWindow):
         """
         apple_x, apple_y = self.apple_mechanics.get_coords()
         
-        # ⭐️ DEBUG: Print coordinates being compared
-        print(f"➡️ Checking collision: Snake at ({self.current_x}, {self.current_y}) vs Apple at ({apple_x}, {apple_y})")
+        # ⭐️ DEBUG: Log coordinates being compared (only built when debug logging is on)
+        if log.debug_enabled:
+            log.debug("collision_check", snake=(self.current_x, self.current_y), apple=(apple_x, apple_y))
         
         # Check if the coordinates of the snake (current) and the apple (apple_x/y) are equal
         if self.current_x == apple_x and self.current_y == apple_y:
             self.score += 1
-            self.score_label.setText(f"Puntuación: {self.score}")
-            print(f"🎉 COLLISION! Current score: {self.score}")
+            self.canvas.set_score(self.score)
+            log.info("apple_eaten", score=self.score)
             
             # Use the method from the separate mechanics class
             self.apple_mechanics.place_random_apple()
@@ -199,44 +201,32 @@ class MainWindow(QMainWindow):
         self.current_x = new_x
         self.current_y = new_y
         
-        # Visually move the QLabel to the new position
-        self.snake_label.move(new_x, new_y) 
+        # Visually move the snake (only the old and new cells are repainted)
+        self.segments[0] = (new_x, new_y)
+        self.canvas.set_snake(self.segments)
         
         # After moving the snake, check for collision
         self.check_collision_and_score()
         
-        print(f"✅ Valid Movement: Snake moved to ({new_x}, {new_y})")
+        if log.debug_enabled:
+            log.debug("snake_moved", x=new_x, y=new_y)
         
     def keyPressEvent(self, event):
         """
-        Detects key presses and updates the stored direction (self.direction).
-        The movement continues via QTimer.
+        Queues the turn for the next ticks (at most MAX_QUEUED_TURNS). Each turn is
+        validated against the last queued one (or the current direction), so two quick
+        presses within one tick (e.g. up then left) are both applied, one per tick.
+        The movement itself is done by the QTimer tick.
         """
         key = event.key()
-        
-        new_direction = None
-
-        if key == Qt.Key_Up:
-            if self.direction != Qt.Key_Down: # Prevent immediate reverse
-                new_direction = key
-        elif key == Qt.Key_Down:
-            if self.direction != Qt.Key_Up: # Prevent immediate reverse
-                new_direction = key
-        elif key == Qt.Key_Left:
-            if self.direction != Qt.Key_Right: # Prevent immediate reverse
-                new_direction = key
-        elif key == Qt.Key_Right:
-            if self.direction != Qt.Key_Left: # Prevent immediate reverse
-                new_direction = key
-        
-        if new_direction is not None:
-            self.direction = new_direction
-            
-            # Execute the movement immediately to ensure responsiveness on first key press
-            # The QTimer handles the continuous movement afterward.
-            self.move_snake_auto()
-        else:
+        if key not in OPPOSITE_KEYS:
             super().keyPressEvent(event)
+            return
+
+        last_direction = self.pending_turns[-1][0] if self.pending_turns else self.direction
+        # Prevent reverse (and repeating the same direction); drop the key if the queue is full
+        if key != last_direction and key != OPPOSITE_KEYS[last_direction] and len(self.pending_turns) < MAX_QUEUED_TURNS:
+            self.pending_turns.append((key, time.perf_counter()))
         
 if __name__ == '__main__':
     app = QApplication(sys.argv)
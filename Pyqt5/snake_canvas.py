@@ -0,0 +1,114 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QPixmap, QFont, QFontMetrics, QStaticText, QColor, QTransform
+from PyQt5.QtCore import Qt, QRect, QPoint
+
+# =================================================================
+# CLASE: LIENZO DEL JUEGO (SnakeCanvas)
+# Reemplaza a los QLabel con emoji movidos con move(): mover un widget
+# pasa por geometría, hoja de estilo y rasterizado de la fuente de
+# emoji en cada tick. Aquí los emoji se rasterizan una sola vez en
+# QPixmap, la puntuación es un QStaticText y paintEvent solo repinta
+# los rectángulos que cambiaron (segmentos, manzana y puntuación).
+# =================================================================
+BACKGROUND_COLOR = QColor("#f0f0f0")
+SCORE_BOX_COLOR = QColor("#333333")
+SCORE_PADDING = 5
+
+
+def emoji_pixmap(emoji, size):
+    """Renders an emoji once into a transparent QPixmap (same look as QLabel with font-size: {size}px)."""
+    font = QFont()
+    font.setPixelSize(size)
+    metrics = QFontMetrics(font)
+    pixmap = QPixmap(max(1, metrics.horizontalAdvance(emoji)), max(1, metrics.height()))
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setFont(font)
+    painter.drawText(0, metrics.ascent(), emoji)
+    painter.end()
+    return pixmap
+
+
+class SnakeCanvas(QWidget):
+    """
+    Canvas that draws the snake (any number of segments, head first), the apple
+    and the score box from cached pixmaps. Setters only schedule update(rect)
+    for the areas that changed; Qt merges them into one paintEvent.
+    """
+    def __init__(self, label_size, parent=None, head="🐍", body="🐍", apple="🍎"):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent) # paintEvent paints the whole dirty area itself
+
+        self.head_pixmap = emoji_pixmap(head, label_size)
+        self.body_pixmap = self.head_pixmap if body == head else emoji_pixmap(body, label_size)
+        self.apple_pixmap = emoji_pixmap(apple, label_size)
+
+        self.segments = [] # (x, y) in pixels, head first
+        self.apple = None
+
+        self.score_font = QFont()
+        self.score_font.setPixelSize(24)
+        self.score_text = QStaticText()
+        self.score_text.setPerformanceHint(QStaticText.AggressiveCaching)
+        self.score_rect = QRect()
+        self.set_score(0)
+
+    # --- State setters (schedule partial repaints) ---
+
+    def set_snake(self, segments):
+        """Replaces the snake segments; repaints the cells that appear or disappear."""
+        old = set(self.segments)
+        new = set(segments)
+        head_changed = bool(self.segments) and bool(segments) and self.segments[0] != segments[0]
+        for x, y in old ^ new:
+            self.update(self._segment_rect(x, y))
+        if head_changed:
+            # The old head is now body (or gone) and the new head has its own pixmap
+            self.update(self._segment_rect(*self.segments[0]))
+            self.update(self._segment_rect(*segments[0]))
+        self.segments = list(segments)
+
+    def set_apple(self, x, y):
+        if self.apple is not None:
+            self.update(QRect(QPoint(*self.apple), self.apple_pixmap.size()))
+        self.apple = (x, y)
+        self.update(QRect(QPoint(x, y), self.apple_pixmap.size()))
+
+    def set_score(self, score):
+        """Lays the score text out once per change (QStaticText) and repaints only its box."""
+        self.score_text.setText(f"Puntuación: {score}")
+        self.score_text.prepare(QTransform(), self.score_font)
+        size = self.score_text.size().toSize()
+        old_rect = self.score_rect
+        self.score_rect = QRect(10, 10, size.width() + 2 * SCORE_PADDING, size.height() + 2 * SCORE_PADDING)
+        self.update(old_rect.united(self.score_rect))
+
+    def _segment_rect(self, x, y):
+        return QRect(QPoint(x, y), self.body_pixmap.size())
+
+    # --- Painting ---
+
+    def paintEvent(self, event):
+        area = event.rect()
+        painter = QPainter(self)
+        painter.fillRect(area, BACKGROUND_COLOR)
+
+        if self.apple is not None:
+            painter.drawPixmap(QPoint(*self.apple), self.apple_pixmap)
+
+        # Body from tail to head so the head ends up on top; only segments touching the dirty area
+        size = self.body_pixmap.size()
+        for i in range(len(self.segments) - 1, -1, -1):
+            x, y = self.segments[i]
+            if area.intersects(QRect(QPoint(x, y), size)):
+                painter.drawPixmap(x, y, self.head_pixmap if i == 0 else self.body_pixmap)
+
+        if area.intersects(self.score_rect):
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(SCORE_BOX_COLOR)
+            painter.drawRoundedRect(self.score_rect, 5, 5)
+            painter.setPen(Qt.white)
+            painter.setFont(self.score_font)
+            painter.drawStaticText(self.score_rect.topLeft() + QPoint(SCORE_PADDING, SCORE_PADDING), self.score_text)
+        painter.end()
@@ -0,0 +1,244 @@
+import argparse
+import random
+import time
+from array import array
+from collections import deque
+
+from motor_serpiente import IndiceCeldasLibres, DIRECCIONES
+
+# =================================================================
+# ARENA DE VARIAS SERPIENTES (ArenaSerpientes)
+# Decenas o cientos de serpientes (humanas o con un controlador) en un
+# mismo tablero con teletransporte. Todas comparten una sola grilla
+# `ocupante` (qué serpiente hay en cada celda) y un índice de celdas
+# libres para las manzanas. Cada tick se resuelve en una pasada:
+#   1. cada serpiente calcula su nueva cabeza y si come,
+#   2. las colas de las que no comen se liberan (ya no estorban),
+#   3. dos cabezas en la misma celda mueren las dos (cabeza contra
+#      cabeza) y una cabeza sobre un cuerpo muere (cabeza contra cuerpo).
+# El costo por tick depende de la cantidad de serpientes vivas, no de
+# la suma de sus largos; solo al morir se recorre el cuerpo (una vez).
+# =================================================================
+LIBRE = -1 # Valor de `ocupante` para una celda sin serpiente
+CHOQUE_CABEZAS = -2 # Valor de `muerta_por` cuando dos cabezas chocaron
+INTENTOS_MANZANA = 8 # Sorteos para no poner una manzana encima de otra
+
+
+class SerpienteArena:
+    """Una serpiente de la arena. cuerpo es un deque de celdas planas con la cabeza primero."""
+    def __init__(self, id, celda, direccion, controlador=None):
+        self.id = id
+        self.cuerpo = deque([celda])
+        self.direccion = direccion
+        self.controlador = controlador # Función (arena, serpiente) -> dirección o None; None = humana
+        self.viva = True
+        self.puntuacion = 0
+        self.muerta_por = None # id de la serpiente con cuyo cuerpo chocó, o CHOQUE_CABEZAS
+
+    def cambiar_direccion(self, nueva_direccion):
+        """Misma regla que MotorSerpiente: solo giros de 90 grados."""
+        dx, dy = self.direccion
+        nx, ny = nueva_direccion
+        if (nx == 0 and dy == 0) or (ny == 0 and dx == 0):
+            self.direccion = nueva_direccion
+            return True
+        return False
+
+
+class ArenaSerpientes:
+    def __init__(self, ancho, alto, semilla=None, manzanas=1):
+        self.ancho = ancho
+        self.alto = alto
+        self.rng = random.Random(semilla)
+        total = ancho * alto
+        self.ocupante = array('i', [LIBRE]) * total # Grilla compartida: id de la serpiente en cada celda
+        self.libres = IndiceCeldasLibres(total) # Celdas sin serpiente (las manzanas cuentan como libres)
+        self.manzanas = set()
+        self.manzanas_pendientes = manzanas # Manzanas que todavía no encontraron lugar (se reintentan cada tick)
+        self.serpientes = []
+        self.vivas = []
+        self.ticks = 0
+        self._colocar_manzanas()
+
+    def agregar_serpiente(self, controlador=None):
+        """Crea una serpiente de largo 1 en una celda libre al azar. Retorna su id (o None si no hay lugar)."""
+        celda = self._celda_libre_sin_manzana()
+        if celda is None:
+            return None
+        serpiente = SerpienteArena(len(self.serpientes), celda, self.rng.choice(DIRECCIONES), controlador)
+        self._ocupar(celda, serpiente.id)
+        self.serpientes.append(serpiente)
+        self.vivas.append(serpiente)
+        return serpiente.id
+
+    def step(self, acciones=None):
+        """
+        Avanza un tick para todas las serpientes vivas. acciones es un dict
+        {id: dirección} para las serpientes humanas; las que tienen controlador
+        le preguntan a él. Retorna la lista de serpientes que murieron en el tick.
+        """
+        ancho, alto = self.ancho, self.alto
+
+        # 1. Giros y nuevas cabezas
+        movimientos = []
+        cabezas = {} # celda -> cuántas cabezas llegan a ella
+        for serpiente in self.vivas:
+            direccion = acciones.get(serpiente.id) if acciones else None
+            if serpiente.controlador:
+                direccion = serpiente.controlador(self, serpiente)
+            if direccion is not None:
+                serpiente.cambiar_direccion(direccion)
+
+            cabeza = serpiente.cuerpo[0]
+            dx, dy = serpiente.direccion
+            nueva = ((cabeza // ancho + dy) % alto) * ancho + (cabeza % ancho + dx) % ancho
+            come = nueva in self.manzanas
+            movimientos.append((serpiente, nueva, come))
+            cabezas[nueva] = cabezas.get(nueva, 0) + 1
+
+        # 2. Las colas se mueven al mismo tiempo que las cabezas: se liberan antes de revisar choques
+        for serpiente, nueva, come in movimientos:
+            if not come:
+                self._liberar(serpiente.cuerpo.pop())
+
+        # 3. Choques (una sola pasada): las cabezas que sobreviven no se pisan entre sí
+        muertas = []
+        comidas = 0
+        for serpiente, nueva, come in movimientos:
+            if cabezas[nueva] > 1:
+                serpiente.muerta_por = CHOQUE_CABEZAS
+            elif self.ocupante[nueva] != LIBRE:
+                serpiente.muerta_por = self.ocupante[nueva]
+            else:
+                self._ocupar(nueva, serpiente.id)
+                serpiente.cuerpo.appendleft(nueva)
+                if come:
+                    serpiente.puntuacion += 1
+                    self.manzanas.discard(nueva)
+                    comidas += 1
+                continue
+            muertas.append(serpiente)
+
+        # Las manzanas nuevas van después de mover todas las cabezas (así ninguna cae bajo una cabeza recién llegada)
+        self.manzanas_pendientes += comidas
+        if self.manzanas_pendientes:
+            self._colocar_manzanas()
+
+        # 4. Las serpientes muertas dejan libre su cuerpo (cada segmento se recorre una sola vez)
+        if muertas:
+            for serpiente in muertas:
+                serpiente.viva = False
+                for celda in serpiente.cuerpo:
+                    self._liberar(celda)
+                serpiente.cuerpo.clear()
+            self.vivas = [serpiente for serpiente in self.vivas if serpiente.viva]
+
+        self.ticks += 1
+        return muertas
+
+    def _ocupar(self, celda, id):
+        self.ocupante[celda] = id
+        self.libres.ocupar(celda)
+
+    def _liberar(self, celda):
+        self.ocupante[celda] = LIBRE
+        self.libres.liberar(celda)
+
+    def _celda_libre_sin_manzana(self):
+        for _ in range(INTENTOS_MANZANA):
+            celda = self.libres.elegir(self.rng)
+            if celda is None or celda not in self.manzanas:
+                return celda
+        return None
+
+    def _colocar_manzanas(self):
+        """
+        Coloca las manzanas pendientes. Si los sorteos no encuentran lugar (tablero
+        lleno o casi) las que faltan quedan pendientes para el próximo tick, así la
+        arena no pierde manzanas para siempre.
+        """
+        while self.manzanas_pendientes:
+            celda = self._celda_libre_sin_manzana()
+            if celda is None:
+                return
+            self.manzanas.add(celda)
+            self.manzanas_pendientes -= 1
+
+    def state(self):
+        return {
+            "ticks": self.ticks,
+            "vivas": len(self.vivas),
+            "manzanas": sorted((celda % self.ancho, celda // self.ancho) for celda in self.manzanas),
+            "puntuaciones": [serpiente.puntuacion for serpiente in self.serpientes],
+        }
+
+
+# =================================================================
+# CONTROLADORES DE EJEMPLO (bots para simulaciones y torneos)
+# =================================================================
+def bot_aleatorio(prob_giro=0.1):
+    """Sigue derecho y de vez en cuando gira al azar."""
+    def controlador(arena, serpiente):
+        if arena.rng.random() < prob_giro:
+            return arena.rng.choice(DIRECCIONES)
+        return None
+    return controlador
+
+
+def bot_goloso(arena, serpiente):
+    """
+    Va hacia la manzana más cercana (distancia con teletransporte) eligiendo
+    entre las celdas vecinas que no tienen serpiente. O(manzanas) por tick.
+    """
+    ancho, alto = arena.ancho, arena.alto
+    cabeza = serpiente.cuerpo[0]
+    x, y = cabeza % ancho, cabeza // ancho
+    dx, dy = serpiente.direccion
+
+    mejor, mejor_distancia = None, None
+    for direccion in DIRECCIONES:
+        nx, ny = direccion
+        if nx == -dx and ny == -dy:
+            continue # No puede dar la vuelta
+        vx, vy = (x + nx) % ancho, (y + ny) % alto
+        if arena.ocupante[vy * ancho + vx] != LIBRE:
+            continue
+        distancia = min((distancia_toro(vx, vy, manzana % ancho, manzana // ancho, ancho, alto)
+                         for manzana in arena.manzanas), default=0)
+        if mejor is None or distancia < mejor_distancia:
+            mejor, mejor_distancia = direccion, distancia
+    return mejor
+
+
+def distancia_toro(x0, y0, x1, y1, ancho, alto):
+    dx = abs(x0 - x1)
+    dy = abs(y0 - y1)
+    return min(dx, ancho - dx) + min(dy, alto - dy)
+
+
+if __name__ == '__main__':
+    # Ej: python arena_serpientes.py --serpientes 200 --tablero 200x200 --ticks 2000
+    parser = argparse.ArgumentParser(description="Torneo de bots en una arena compartida")
+    parser.add_argument("--serpientes", type=int, default=100)
+    parser.add_argument("--tablero", default="160x100", metavar="ANCHOxALTO")
+    parser.add_argument("--manzanas", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--semilla", type=int, default=0)
+    argumentos = parser.parse_args()
+
+    ancho, alto = (int(n) for n in argumentos.tablero.lower().split("x"))
+    arena = ArenaSerpientes(ancho, alto, argumentos.semilla, argumentos.manzanas)
+    for i in range(argumentos.serpientes):
+        arena.agregar_serpiente(bot_goloso if i % 2 else bot_aleatorio())
+
+    inicio = time.perf_counter()
+    for _ in range(argumentos.ticks):
+        arena.step()
+        if not arena.vivas:
+            break
+    duracion = time.perf_counter() - inicio
+
+    print(f"{arena.ticks} ticks en {duracion:.2f} s ({arena.ticks / duracion:,.0f} ticks/s), vivas: {len(arena.vivas)}")
+    for serpiente in sorted(arena.serpientes, key=lambda s: -s.puntuacion)[:5]:
+        tipo = "goloso" if serpiente.controlador is bot_goloso else "aleatorio"
+        print(f"  #{serpiente.id:<4} {tipo:9} puntuación {serpiente.puntuacion:4}  {'viva' if serpiente.viva else 'muerta'}")
@@ -0,0 +1,152 @@
+import argparse
+import json
+import platform
+import time
+import timeit
+
+from motor_serpiente import MotorSerpiente, CuerpoSerpiente, IndiceMitades, DERECHA, IZQUIERDA
+
+# =================================================================
+# MICRO-BENCHMARKS DEL MOTOR
+# Mide por separado mover_serpiente, chequeo_colision_manzana,
+# colocar_manzana_random, colocar_manzana_segura y las fotos del estado
+# (snapshot y restore) con serpientes de distinto largo (1 celda hasta
+# el 95 % del tablero) y tableros de distinto tamaño. Los resultados se guardan en JSON y se pueden
+# comparar con una corrida anterior:
+#
+#   python bench_motor.py --salida nuevo.json --comparar viejo.json
+# =================================================================
+
+TABLEROS = [(40, 25), (100, 100), (320, 200), (1000, 1000)]
+FRACCIONES_LARGO = [0.0, 0.01, 0.10, 0.50, 0.95] # 0.0 = serpiente de una sola celda
+REPETICIONES = 3 # Se toma la mejor de varias mediciones
+
+
+def preparar_motor(ancho, alto, largo, semilla=0):
+    """
+    Crea un motor con una serpiente de `largo` celdas que recorre el tablero
+    en zigzag por filas (sin pisarse), con la cabeza al final del recorrido.
+    """
+    motor = MotorSerpiente(ancho, alto, semilla)
+    total = ancho * alto
+
+    # Cuerpo nuevo en vez del segmento inicial del centro
+    motor.libres = IndiceMitades(ancho, alto)
+    motor.cuerpo = CuerpoSerpiente(total, motor.libres)
+    motor.mecanicas_manzana.libres = motor.libres
+
+    for k in range(largo):
+        fila, columna = divmod(k, ancho)
+        if fila % 2:
+            columna = ancho - 1 - columna # Las filas impares se recorren de derecha a izquierda
+        motor.cuerpo.crecer(fila * ancho + columna)
+
+    fila_cabeza = (largo - 1) // ancho
+    motor.direccion_actual = IZQUIERDA if fila_cabeza % 2 else DERECHA
+    motor.cola_anterior = motor.cuerpo.cola()
+    _alejar_manzana(motor, fila_cabeza)
+    return motor
+
+
+def _alejar_manzana(motor, fila_cabeza):
+    """
+    Deja la manzana en una celda libre fuera de la fila de la cabeza, así al medir
+    mover_serpiente (que avanza en línea recta por esa fila) no se come ninguna.
+    """
+    libres = motor.libres
+    for i in range(min(len(libres), 64)):
+        celda = libres.celdas[i]
+        if celda // motor.ancho != fila_cabeza:
+            motor.mecanicas_manzana.manzana_x = celda % motor.ancho
+            motor.mecanicas_manzana.manzana_y = celda // motor.ancho
+            return
+
+
+def medir(funcion):
+    """Nanosegundos por llamada (mejor de REPETICIONES, cada una de ~0.2 s)."""
+    temporizador = timeit.Timer(funcion)
+    mejor = None
+    for _ in range(REPETICIONES):
+        cantidad, segundos = temporizador.autorange()
+        por_llamada = segundos / cantidad
+        if mejor is None or por_llamada < mejor:
+            mejor = por_llamada
+    return mejor * 1e9
+
+
+def correr(tableros=TABLEROS, fracciones=FRACCIONES_LARGO):
+    resultados = []
+    for ancho, alto in tableros:
+        total = ancho * alto
+        for fraccion in fracciones:
+            largo = max(1, int(total * fraccion))
+            motor = preparar_motor(ancho, alto, largo)
+            manzana = motor.mecanicas_manzana
+
+            casos = {
+                "mover_serpiente": motor.mover_serpiente,
+                "chequeo_colision_manzana": motor.chequeo_colision_manzana, # Caso común: la cabeza no está en la manzana
+                "colocar_manzana_random": lambda: manzana.colocar_manzana_random(motor.direccion_actual),
+                "colocar_manzana_segura": manzana.colocar_manzana_segura,
+                "snapshot": motor.snapshot,
+                "restore": lambda: motor.restore(foto),
+            }
+            foto = motor.snapshot()
+            for nombre, funcion in casos.items():
+                if nombre == "mover_serpiente":
+                    _alejar_manzana(motor, motor.cuerpo.cabeza() // ancho)
+                ns = medir(funcion)
+                resultados.append({
+                    "funcion": nombre,
+                    "ancho": ancho,
+                    "alto": alto,
+                    "largo": largo,
+                    "ocupacion": round(largo / total, 4),
+                    "ns_por_llamada": round(ns, 1),
+                })
+                print(f"{nombre:26} {ancho:5}x{alto:<5} largo={largo:<8} {ns:14,.0f} ns")
+    return resultados
+
+
+def comparar(actuales, anteriores):
+    """Imprime la razón nuevo/anterior para cada caso que esté en las dos corridas."""
+    clave = lambda r: (r["funcion"], r["ancho"], r["alto"], r["largo"])
+    previos = {clave(r): r["ns_por_llamada"] for r in anteriores}
+    print("\nComparación con la corrida anterior (nuevo / anterior):")
+    for r in actuales:
+        anterior = previos.get(clave(r))
+        if anterior:
+            razon = r["ns_por_llamada"] / anterior
+            marca = "  <-- más lento" if razon > 1.10 else ""
+            print(f"{r['funcion']:26} {r['ancho']:5}x{r['alto']:<5} largo={r['largo']:<8} x{razon:6.2f}{marca}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-benchmarks del motor de la serpiente")
+    parser.add_argument("--salida", default="bench_motor.json", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", metavar="JSON", help="resultados de una corrida anterior para comparar")
+    parser.add_argument("--tableros", help="lista de tableros, ej: 40x25,100x100 (por defecto todos)")
+    argumentos = parser.parse_args()
+
+    tableros = TABLEROS
+    if argumentos.tableros:
+        tableros = [tuple(int(n) for n in t.split("x")) for t in argumentos.tableros.split(",")]
+
+    # La corrida anterior se lee antes de medir: --salida puede ser el mismo archivo y lo pisaría
+    anteriores = None
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            anteriores = json.load(archivo)["resultados"]
+
+    resultados = correr(tableros)
+    with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+        json.dump({
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "maquina": platform.machine(),
+            "resultados": resultados,
+        }, archivo, indent=2)
+    print(f"\nResultados guardados en {argumentos.salida}")
+
+    if anteriores is not None:
+        comparar(resultados, anteriores)
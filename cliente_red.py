@@ -0,0 +1,290 @@
+import argparse
+import socket
+
+from motor_serpiente import MotorSerpiente, MAX_GIROS_EN_COLA, DIRECCIONES, ARRIBA, IZQUIERDA
+from servidor_juego import (ESTADO, DELTA, FIN, GIRO, TIPO_ESTADO, TIPO_DELTA, TIPO_FIN, SIN_GIRO, PartidaRemota,
+                            mensaje_estado, mensaje_giro)
+
+# =================================================================
+# CLIENTE DE RED CON PREDICCIÓN (ClientePredictivo)
+# Esperar al servidor para mover la serpiente agrega la latencia de ida
+# y vuelta a cada tecla. Como el motor es determinista y el servidor
+# manda la semilla, el cliente simula su propia partida unos ticks por
+# delante del servidor y pide cada giro para el tick en que lo aplicó.
+# Si el giro llega a tiempo el servidor hace lo mismo y no hay nada que
+# corregir. Cuando un DELTA no coincide con lo predicho (el giro llegó
+# tarde) el cliente vuelve a la foto de ese tick (motor.snapshot), pone
+# el giro donde lo aplicó el servidor y vuelve a simular hasta el tick
+# en que estaba: unos microsegundos por tick re-simulado.
+# El socket no bloquea: recibir() se llama una vez por frame. Los giros
+# se juntan en un buffer de salida y se mandan de a lo que acepte el
+# socket; lo que no entra sale en el próximo frame.
+# =================================================================
+ADELANTO_INICIAL = 2 # Ticks que el cliente va por delante del último tick confirmado
+MAX_ADELANTO = 20 # Tope del adelanto (y de cuánto puede adelantarse el cliente sin confirmaciones)
+
+
+class ClientePredictivo:
+    def __init__(self, host, puerto, espera=5.0, conexion=None):
+        """
+        Se conecta (o usa `conexion`, un socket ya conectado) y lee el estado inicial
+        (bloqueando). La partida se arma después con iniciar(motor).
+        """
+        if conexion is None:
+            conexion = socket.create_connection((host, puerto), espera)
+            conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Los giros son mensajes chicos y urgentes
+        self.socket = conexion
+        self.buffer = bytearray()
+        self.salida = bytearray() # Giros todavía sin mandar (send parcial o socket lleno)
+
+        while len(self.buffer) < ESTADO.size:
+            self._recibir_bloqueando()
+        (tipo, tick, self.ancho, self.alto, self.ticks_por_segundo, self.semilla, choque, _, largo,
+         _) = ESTADO.unpack_from(self.buffer)
+        if tipo != TIPO_ESTADO or tick != 0:
+            raise ValueError("El servidor no empezó con el estado inicial de la partida")
+        while len(self.buffer) < ESTADO.size + 4 * largo:
+            self._recibir_bloqueando()
+        del self.buffer[:ESTADO.size + 4 * largo] # Con la semilla alcanza: el motor local arma el mismo estado
+        self.choque_cuerpo = bool(choque)
+        self.socket.setblocking(False)
+
+        self.motor = None
+        self.giros = {} # tick -> dirección que el cliente aplica en ese tick (todavía sin confirmar)
+        self.ultimo_giro = (-1, None) # (tick, dirección) del último giro pedido
+        self.historial = {} # tick -> (foto antes del tick, giro aplicado, cabeza después) de los ticks sin confirmar
+        self.confirmado = 0 # Ticks que el servidor ya confirmó
+        self.adelanto = ADELANTO_INICIAL
+        self.rebobinados = 0
+        self.terminado = False
+
+    def iniciar(self, motor):
+        """Usa `motor` (recién creado con self.semilla, self.ancho, self.alto y self.choque_cuerpo) para predecir."""
+        if motor.semilla != self.semilla or motor.ticks != 0:
+            raise ValueError("El motor local debe empezar con la semilla del servidor")
+        self.motor = motor
+
+    def _recibir_bloqueando(self):
+        datos = self.socket.recv(4096)
+        if not datos:
+            raise ConnectionError("El servidor cerró la conexión")
+        self.buffer += datos
+
+    # --- Entrada local ---
+
+    def encolar_giro(self, direccion):
+        """
+        Programa el giro para el primer tick libre (uno por tick, como la cola del
+        motor) y se lo pide al servidor para ese mismo tick. Retorna si se aceptó.
+        """
+        tick, anterior = self.ultimo_giro
+        if tick < self.motor.ticks:
+            tick, anterior = self.motor.ticks - 1, self.motor.direccion_actual
+        tick += 1
+        if tick - self.motor.ticks >= MAX_GIROS_EN_COLA:
+            return False # Cola llena: se descarta la tecla
+        dx, dy = anterior
+        nx, ny = direccion
+        if not ((nx == 0 and dy == 0) or (ny == 0 and dx == 0)):
+            return False
+        self.giros[tick] = direccion
+        self.ultimo_giro = (tick, direccion)
+        self.salida += mensaje_giro(direccion, tick)
+        self._enviar()
+        return True
+
+    def _enviar(self):
+        """Manda lo que acepte el socket del buffer de salida sin bloquear."""
+        try:
+            while self.salida:
+                del self.salida[:self.socket.send(self.salida)]
+        except BlockingIOError:
+            pass # Socket lleno: el resto sale en el próximo recibir()
+        except ConnectionError:
+            self.terminado = True
+
+    def puede_avanzar(self):
+        """False si el cliente ya va MAX_ADELANTO ticks por delante del servidor (espera confirmaciones)."""
+        return self.motor.ticks < self.confirmado + MAX_ADELANTO
+
+    def step(self):
+        """
+        Simula un tick local guardando la foto previa por si hay que rebobinar.
+        No retorna si la serpiente sigue viva: un choque local es solo una
+        predicción (un rebobinado lo puede deshacer) y la partida termina
+        cuando el servidor manda FIN (self.terminado).
+        """
+        motor = self.motor
+        tick = motor.ticks
+        foto = motor.snapshot()
+        antes = motor.direccion_actual
+        motor.step(self.giros.get(tick))
+        if motor.ticks > tick:
+            aplicado = motor.direccion_actual if motor.direccion_actual != antes else None
+            self.historial[tick] = (foto, aplicado, motor.cuerpo.cabeza())
+
+    # --- Mensajes del servidor ---
+
+    def recibir(self):
+        """
+        Procesa todo lo que llegó del servidor sin bloquear y vuelve a ponerse
+        `adelanto` ticks por delante. Retorna True si el motor cambió fuera de
+        los step() normales (rebobinado o ticks recuperados): hay que repintar todo.
+        """
+        self._enviar()
+        try:
+            while True:
+                datos = self.socket.recv(65536)
+                if not datos:
+                    self.terminado = True
+                    break
+                self.buffer += datos
+        except BlockingIOError:
+            pass # No hay más datos por ahora
+        except ConnectionError:
+            self.terminado = True # Conexión reiniciada: se procesa lo que ya llegó
+
+        cambio = False
+        buffer = self.buffer
+        leido = 0
+        while leido < len(buffer):
+            tipo = buffer[leido]
+            if tipo == TIPO_DELTA:
+                if len(buffer) - leido < DELTA.size:
+                    break
+                _, tick, cabeza, _, _, giro = DELTA.unpack_from(buffer, leido)
+                leido += DELTA.size
+                cambio |= self._confirmar(tick - 1, cabeza, giro)
+            elif tipo == TIPO_FIN:
+                if len(buffer) - leido < FIN.size:
+                    break
+                leido += FIN.size
+                self.terminado = True
+            else:
+                raise ValueError(f"Mensaje inesperado del servidor: {tipo}")
+        del buffer[:leido]
+
+        # Si el cliente quedó atrás (ventana trabada, red lenta) recupera los ticks de golpe
+        while self.motor.vivo and self.motor.ticks < self.confirmado + self.adelanto:
+            self.step()
+            cambio = True
+        return cambio
+
+    def _confirmar(self, tick, cabeza, giro):
+        """Compara el tick `tick` del servidor con lo predicho; si no coincide, rebobina. Retorna si rebobinó."""
+        motor = self.motor
+        self.confirmado = tick + 1
+        direccion = DIRECCIONES[giro] if giro < len(DIRECCIONES) else None
+        consumido = giro != SIN_GIRO
+        if motor.vivo and motor.ticks == tick:
+            # El servidor va por delante de lo simulado: el tick se simula directamente con su giro
+            self._reprogramar(tick, direccion, consumido)
+            self.step()
+
+        foto, aplicado, cabeza_local = self.historial.pop(tick, (None, None, None))
+        if foto is None:
+            return False # La serpiente local ya había chocado
+        if aplicado == direccion and cabeza_local == cabeza:
+            self.giros.pop(tick, None)
+            return False
+
+        # El servidor aplicó otra cosa en este tick: se vuelve a la foto y se re-simula hasta donde se estaba
+        hasta = motor.ticks
+        if not consumido and tick in self.giros:
+            self.adelanto = min(self.adelanto + 1, MAX_ADELANTO) # El giro llegó tarde: conviene ir más adelantado
+        self._reprogramar(tick, direccion, consumido)
+        motor.restore(foto)
+        self.historial.clear()
+        self.step() # El tick confirmado, con el giro del servidor (queda en self.giros hasta acá)
+        self.giros.pop(tick, None)
+        self.historial.clear()
+        while motor.vivo and motor.ticks < hasta:
+            self.step()
+        self.rebobinados += 1
+        return True
+
+    def _reprogramar(self, tick, direccion, consumido):
+        """
+        Deja en `tick` el giro que aplicó el servidor. Si el servidor usó un giro
+        pedido se saca el primero pendiente; los demás siguen en orden, como
+        mínimo un tick después (el servidor los aplica apenas le llegan).
+        """
+        pendientes = sorted((t, d) for t, d in self.giros.items() if t >= tick)
+        for t, _ in pendientes:
+            del self.giros[t]
+        if consumido and pendientes:
+            pendientes.pop(0)
+        if direccion is not None:
+            self.giros[tick] = direccion
+        anterior = tick
+        for t, d in pendientes:
+            anterior = max(t, anterior + 1)
+            self.giros[anterior] = d
+        ultimo = max(self.giros, default=-1)
+        self.ultimo_giro = (ultimo, self.giros.get(ultimo))
+
+    def cerrar(self):
+        self.socket.close()
+
+
+def prueba_rebobinado(semilla=7):
+    """
+    Un cliente contra una partida del servidor por un socketpair, sin reloj:
+      1. un giro que llega tarde (el servidor lo aplica dos ticks después que el cliente),
+      2. un giro que el servidor aplica antes del tick en que lo predijo el cliente.
+    Después de cada DELTA la cabeza del último tick confirmado tiene que ser la del
+    servidor: el rebobinado re-simula con el giro que aplicó el servidor.
+    """
+    lado_cliente, lado_servidor = socket.socketpair()
+    partida = PartidaRemota(MotorSerpiente(semilla=semilla), None)
+    servidor = partida.motor
+    lado_servidor.sendall(mensaje_estado(servidor))
+    cliente = ClientePredictivo(None, None, conexion=lado_cliente)
+    cliente.iniciar(MotorSerpiente(cliente.ancho, cliente.alto, cliente.semilla, cliente.choque_cuerpo))
+
+    def cabeza_confirmada():
+        foto = cliente.historial.get(cliente.confirmado)
+        if foto is None:
+            return cliente.motor.cuerpo.cabeza()
+        motor = MotorSerpiente(cliente.ancho, cliente.alto)
+        motor.restore(foto[0]) # Foto de antes del tick siguiente = estado del tick confirmado
+        return motor.cuerpo.cabeza()
+
+    def avanzar_servidor(ticks):
+        for _ in range(ticks):
+            lado_servidor.sendall(partida.avanzar())
+            cliente.recibir()
+            if cabeza_confirmada() != servidor.cuerpo.cabeza():
+                raise AssertionError(f"Tick {servidor.ticks}: el cliente quedó en {cabeza_confirmada()}, "
+                                     f"el servidor en {servidor.cuerpo.cabeza()}")
+
+    # 1. El cliente gira en su tick (va adelantado); el GIRO le llega al servidor dos ticks tarde
+    cliente.recibir()
+    cliente.encolar_giro(ARRIBA)
+    tick_pedido = cliente.motor.ticks
+    cliente.step()
+    avanzar_servidor(tick_pedido + 2)
+    codigo, tick = GIRO.unpack(lado_servidor.recv(GIRO.size))
+    partida.pedir_giro(DIRECCIONES[codigo], tick)
+    avanzar_servidor(3)
+
+    # 2. El cliente programa el giro para su tick (adelantado) y el servidor lo aplica en el suyo
+    cliente.encolar_giro(IZQUIERDA)
+    codigo, _ = GIRO.unpack(lado_servidor.recv(GIRO.size))
+    partida.pedir_giro(DIRECCIONES[codigo], servidor.ticks)
+    avanzar_servidor(4)
+
+    lado_cliente.close()
+    lado_servidor.close()
+    return cliente.rebobinados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cliente de red con predicción del Snake")
+    parser.add_argument("--prueba", action="store_true", help="comprueba los rebobinados con giros tardíos")
+    argumentos = parser.parse_args()
+
+    if argumentos.prueba:
+        print(f"Rebobinados con la cabeza del servidor: {prueba_rebobinado()}")
+    else:
+        parser.print_help()
@@ -0,0 +1,145 @@
+import numpy as np
+
+from motor_serpiente import ANCHO_TABLERO, ALTO_TABLERO
+
+# =================================================================
+# ENTORNO POR LOTES (BatchSnakeEnv)
+# N tableros independientes guardados como arreglos de NumPy. Un solo
+# step(acciones) aplica a todos a la vez las mismas reglas que
+# MotorSerpiente: teletransporte con %, comer la manzana y crecer.
+# =================================================================
+
+# Códigos de acción (índices en DX / DY). -1 = seguir en la misma dirección
+ACCION_ARRIBA = 0
+ACCION_ABAJO = 1
+ACCION_IZQUIERDA = 2
+ACCION_DERECHA = 3
+SIN_ACCION = -1
+
+DX = np.array([0, 0, -1, 1], dtype=np.int64)
+DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+
+
+class BatchSnakeEnv:
+    """
+    Estado de cada tablero (una fila por juego):
+      cabeza_x, cabeza_y : celda de la cabeza
+      direccion          : código de acción actual
+      cuerpo             : buffer circular de celdas (índice plano y * ancho + x)
+      inicio, largo      : posición de la cabeza en el buffer y cantidad de segmentos
+      ocupacion          : contador de segmentos por celda
+      manzana            : celda plana de la manzana (-1 si el tablero está lleno)
+    """
+    def __init__(self, n, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO, semilla=None):
+        self.n = n
+        self.ancho = ancho
+        self.alto = alto
+        self.celdas = ancho * alto
+        self.filas = np.arange(n)
+
+        # Máscaras de la "mitad delantera" para cada dirección (como en colocar_manzana_random)
+        xs = np.arange(self.celdas) % ancho
+        ys = np.arange(self.celdas) // ancho
+        self.mitades = np.empty((4, self.celdas), dtype=bool)
+        self.mitades[ACCION_ARRIBA] = ys < alto // 2
+        self.mitades[ACCION_ABAJO] = ys >= alto // 2
+        self.mitades[ACCION_IZQUIERDA] = xs < ancho // 2
+        self.mitades[ACCION_DERECHA] = xs >= ancho // 2
+
+        # El largo nunca pasa del área del tablero, así la memoria queda acotada
+        self.cuerpo = np.zeros((n, self.celdas), dtype=np.int32)
+        self.ocupacion = np.zeros((n, self.celdas), dtype=np.uint16)
+        self.reset(semilla)
+
+    def reset(self, semilla=None):
+        """Reinicia los N juegos con la serpiente al centro mirando a la derecha."""
+        self.rng = np.random.default_rng(semilla)
+
+        self.cabeza_x = np.full(self.n, (self.ancho - 1) // 2, dtype=np.int64)
+        self.cabeza_y = np.full(self.n, (self.alto - 1) // 2, dtype=np.int64)
+        self.direccion = np.full(self.n, ACCION_DERECHA, dtype=np.int64)
+        self.inicio = np.zeros(self.n, dtype=np.int64)
+        self.largo = np.ones(self.n, dtype=np.int64)
+        self.puntuacion = np.zeros(self.n, dtype=np.int64)
+        self.manzana = np.full(self.n, -1, dtype=np.int64)
+
+        cabeza = self.cabeza_y * self.ancho + self.cabeza_x
+        self.cuerpo[:, 0] = cabeza
+        self.ocupacion.fill(0)
+        self.ocupacion[self.filas, cabeza] = 1
+        self._colocar_manzanas(self.filas)
+
+    def step(self, acciones=None):
+        """
+        Avanza un tick en todos los tableros. acciones es un arreglo (n,) de
+        códigos ACCION_* o SIN_ACCION. Retorna un arreglo bool con los que comieron.
+        """
+        if acciones is not None:
+            acciones = np.asarray(acciones, dtype=np.int64)
+            # Solo se aceptan giros de 90 grados (producto punto 0), igual que cambiar_direccion
+            a = np.where(acciones >= 0, acciones, 0)
+            validas = (acciones >= 0) & (DX[a] * DX[self.direccion] + DY[a] * DY[self.direccion] == 0)
+            self.direccion = np.where(validas, acciones, self.direccion)
+
+        # Movimiento con teletransporte
+        self.cabeza_x = (self.cabeza_x + DX[self.direccion]) % self.ancho
+        self.cabeza_y = (self.cabeza_y + DY[self.direccion]) % self.alto
+        nueva = self.cabeza_y * self.ancho + self.cabeza_x
+
+        # Se lee la cola antes de escribir: con el buffer lleno la nueva cabeza ocupa su lugar
+        cola = self.cuerpo[self.filas, (self.inicio + self.largo - 1) % self.celdas]
+
+        # Inserta la nueva cabeza al frente del buffer circular
+        self.inicio = (self.inicio - 1) % self.celdas
+        self.cuerpo[self.filas, self.inicio] = nueva
+        self.ocupacion[self.filas, nueva] += 1
+
+        comio = nueva == self.manzana
+        self.puntuacion += comio
+
+        # Crece solo si comió y aún cabe en el buffer; si no, se saca la cola
+        crece = comio & (self.largo < self.celdas)
+        sin_crecer = np.flatnonzero(~crece)
+        self.ocupacion[sin_crecer, cola[sin_crecer]] -= 1
+        self.largo += crece
+
+        comieron = np.flatnonzero(comio)
+        if comieron.size:
+            self._colocar_manzanas(comieron)
+        return comio
+
+    def _colocar_manzanas(self, filas):
+        """
+        Coloca una manzana en una celda libre al azar para cada fila indicada,
+        priorizando la mitad hacia donde va la serpiente. Solo se recorre el
+        tablero de los juegos que acaban de comer.
+        """
+        libres = self.ocupacion[filas] == 0
+        candidatas = libres & self.mitades[self.direccion[filas]]
+        # Si la mitad delantera está llena se usa todo el tablero (colocar_manzana_segura)
+        mitad_llena = ~candidatas.any(axis=1)
+        candidatas[mitad_llena] = libres[mitad_llena]
+
+        # El argmax de números aleatorios sobre las celdas candidatas da una elección uniforme
+        puntajes = self.rng.random(candidatas.shape)
+        puntajes[~candidatas] = -1.0
+        elegidas = puntajes.argmax(axis=1)
+        hay_lugar = candidatas.any(axis=1)
+        self.manzana[filas] = np.where(hay_lugar, elegidas, -1)
+
+    def segmentos(self, i):
+        """Celdas (x, y) de la serpiente del juego i, la cabeza primero."""
+        pos = (self.inicio[i] + np.arange(self.largo[i])) % self.celdas
+        planas = self.cuerpo[i, pos]
+        return list(zip((planas % self.ancho).tolist(), (planas // self.ancho).tolist()))
+
+    def state(self):
+        """Retorna copias de los arreglos principales del lote."""
+        return {
+            "cabeza_x": self.cabeza_x.copy(),
+            "cabeza_y": self.cabeza_y.copy(),
+            "direccion": self.direccion.copy(),
+            "largo": self.largo.copy(),
+            "manzana": self.manzana.copy(),
+            "puntuacion": self.puntuacion.copy(),
+        }
@@ -0,0 +1,541 @@
+import math
+import random
+import struct
+from array import array
+from collections import deque
+
+# =================================================================
+# MOTOR DE LA SERPIENTE (sin pygame)
+# Contiene solo las reglas del juego: movimiento con teletransporte,
+# colisión con la manzana, crecimiento y colocación de manzanas.
+# Trabaja en celdas de la cuadrícula (no en píxeles), así el front-end
+# de pygame solo tiene que multiplicar por TAMANO_ELEMENTO para dibujar.
+# El tamaño del tablero es un parámetro: ningún paso de la serpiente ni
+# ninguna manzana nueva recorre el tablero, así que sirve igual para
+# 40x25 que para simulaciones de 1000x1000 celdas.
+# =================================================================
+
+# Tamaño del tablero por defecto (800x500 píxeles con celdas de 20)
+ANCHO_TABLERO = 40
+ALTO_TABLERO = 25
+
+# Direcciones (Vector de movimiento por paso en celdas: X, Y)
+ARRIBA = (0, -1)
+ABAJO = (0, 1)
+IZQUIERDA = (-1, 0)
+DERECHA = (1, 0)
+DIRECCION_INICIAL = DERECHA
+MAX_GIROS_EN_COLA = 3 # Giros que se pueden adelantar entre un tick y el siguiente
+DIRECCIONES = (ARRIBA, ABAJO, IZQUIERDA, DERECHA) # Código de dirección = índice en esta tupla
+CODIGOS = {direccion: codigo for codigo, direccion in enumerate(DIRECCIONES)}
+LIMITE_SEMILLA = 2 ** 63 # Semillas de 0 a LIMITE_SEMILLA - 1: entran en las fotos, las repeticiones y el ESTADO de red
+
+# Fotos del estado (MotorSerpiente.snapshot), little endian:
+#   cabecera FOTO: "SNKF", versión, ancho, alto, modo choque, semilla, ticks, puntuación,
+#                  manzana, cola anterior, dirección, giro aplicado, vivo, giros en cola, largo
+#   giros en cola: un código uint8 cada uno
+#   generador aleatorio: PALABRAS_RNG uint32 (estado del Mersenne Twister) y
+#                        gauss_next como double (NaN si no hay)
+#   cuerpo: largo celdas (la cabeza primero) y la ocupación de cada celda
+#   índice de libres: cantidad y arrays del índice de todo el tablero y de cada
+#                     mitad, tal cual (su orden decide dónde cae la próxima manzana)
+# Las celdas y contadores son uint16 en tableros de hasta 65535 celdas y uint32 en
+# los más grandes (ver tipo_array). Son arrays planos que se copian con memcpy y
+# sin ningún objeto de Python por celda, pero su tamaño depende del tablero y no
+# del largo: unos 18 bytes por celda con 16 bits (~21 KB en 40x25 con el generador) y 36 con 32 bits
+# (~36 MB en 1000x1000, decenas de ms por foto). En tableros así conviene no
+# guardar una foto por tick.
+MAGICO_FOTO = b"SNKF"
+VERSION_FOTO = 2
+FOTO = struct.Struct("<4sBHHBqIIiiBBBBI")
+SIN_DIRECCION = 255
+PALABRAS_RNG = 625 # 624 palabras de estado + la posición dentro de ellas
+GAUSS = struct.Struct("<d")
+TAMANO_RNG = 4 * PALABRAS_RNG + GAUSS.size
+CANTIDAD = struct.Struct("<I")
+
+
+def tipo_array(total):
+    """
+    Typecode de los arrays de celdas, índices y contadores de un tablero de `total`
+    celdas: 16 bits si alcanzan (la mitad de memoria y de foto), si no 32.
+    """
+    return 'H' if total <= 0xFFFF else 'I'
+
+
+def _copiar_en(destino, datos, posicion):
+    """Copia datos[posicion:] sobre todo el array `destino` (memcpy, sin crear objetos). Retorna dónde termina."""
+    vista = memoryview(destino).cast('B')
+    fin = posicion + len(vista)
+    vista[:] = datos[posicion:fin]
+    return fin
+
+
+
+# =================================================================
+# 1. ÍNDICE DE CELDAS LIBRES (IndiceCeldasLibres)
+# Arreglo particionado: las primeras `cantidad` posiciones de `celdas`
+# son las celdas libres y el resto las ocupadas. `posicion` guarda dónde
+# está cada celda, así ocupar/liberar es un intercambio O(1).
+# =================================================================
+class IndiceCeldasLibres:
+    def __init__(self, total, universo=None):
+        tipo = tipo_array(total)
+        if universo is None:
+            self.celdas = array(tipo, range(total)) # Celdas planas (y * ancho + x)
+            self.posicion = array(tipo, range(total)) # posicion[celda] = índice dentro de self.celdas
+        else:
+            # Índice de solo una parte del tablero (ej: una mitad): las demás celdas no se usan
+            self.celdas = array(tipo, universo)
+            self.posicion = array(tipo, [0]) * total
+            for i, celda in enumerate(self.celdas):
+                self.posicion[celda] = i
+        self.cantidad = len(self.celdas) # Cantidad de celdas libres
+
+    def __len__(self):
+        return self.cantidad
+
+    def __contains__(self, celda):
+        return self.posicion[celda] < self.cantidad
+
+    def _intercambiar(self, celda, destino):
+        """Mueve `celda` a la posición `destino` intercambiándola con la que estaba ahí."""
+        origen = self.posicion[celda]
+        otra = self.celdas[destino]
+        self.celdas[destino] = celda
+        self.celdas[origen] = otra
+        self.posicion[celda] = destino
+        self.posicion[otra] = origen
+
+    def ocupar(self, celda):
+        """Saca la celda del grupo de libres (intercambio con la última libre)."""
+        self.cantidad -= 1
+        self._intercambiar(celda, self.cantidad)
+
+    def liberar(self, celda):
+        """Devuelve la celda al grupo de libres."""
+        self._intercambiar(celda, self.cantidad)
+        self.cantidad += 1
+
+    def elegir(self, rng):
+        """Celda libre uniforme al azar en O(1). Retorna None si no hay ninguna."""
+        if not self.cantidad:
+            return None
+        return self.celdas[rng.randrange(self.cantidad)]
+
+    def a_bytes(self):
+        """Estado completo del índice. Se guarda el orden tal cual: de él depende qué celda sale en elegir()."""
+        return CANTIDAD.pack(self.cantidad) + self.celdas.tobytes() + self.posicion.tobytes()
+
+    def cargar_bytes(self, datos, posicion):
+        """Carga lo guardado con a_bytes() desde datos[posicion:] (un memoryview). Retorna dónde termina."""
+        self.cantidad, = CANTIDAD.unpack_from(datos, posicion)
+        posicion = _copiar_en(self.celdas, datos, posicion + CANTIDAD.size)
+        return _copiar_en(self.posicion, datos, posicion)
+
+
+class IndiceMitades(IndiceCeldasLibres):
+    """
+    Índice de libres de todo el tablero que además lleva uno por cada mitad
+    (izquierda, derecha, arriba y abajo). Cada celda está en una mitad
+    horizontal y en una vertical, así ocupar/liberar sigue siendo O(1)
+    (tres intercambios) y elegir una celda libre de la "mitad delantera"
+    o saber si está llena también es O(1).
+    """
+    def __init__(self, ancho, alto):
+        total = ancho * alto
+        super().__init__(total)
+        self.ancho = ancho
+        self.mitad_x = ancho // 2
+        self.mitad_y = alto // 2
+        self.borde = borde = self.mitad_y * ancho # Primera celda de la mitad de abajo
+
+        self.izquierda = IndiceCeldasLibres(total, (y * ancho + x for y in range(alto) for x in range(self.mitad_x)))
+        self.derecha = IndiceCeldasLibres(total, (y * ancho + x for y in range(alto) for x in range(self.mitad_x, ancho)))
+        self.arriba = IndiceCeldasLibres(total, range(borde))
+        self.abajo = IndiceCeldasLibres(total, range(borde, total))
+        self.mitades = {IZQUIERDA: self.izquierda, DERECHA: self.derecha, ARRIBA: self.arriba, ABAJO: self.abajo}
+
+    def ocupar(self, celda):
+        IndiceCeldasLibres.ocupar(self, celda)
+        (self.izquierda if celda % self.ancho < self.mitad_x else self.derecha).ocupar(celda)
+        (self.arriba if celda < self.borde else self.abajo).ocupar(celda)
+
+    def liberar(self, celda):
+        IndiceCeldasLibres.liberar(self, celda)
+        (self.izquierda if celda % self.ancho < self.mitad_x else self.derecha).liberar(celda)
+        (self.arriba if celda < self.borde else self.abajo).liberar(celda)
+
+    def a_bytes(self):
+        return b"".join((IndiceCeldasLibres.a_bytes(self), self.izquierda.a_bytes(), self.derecha.a_bytes(),
+                         self.arriba.a_bytes(), self.abajo.a_bytes()))
+
+    def cargar_bytes(self, datos, posicion):
+        posicion = IndiceCeldasLibres.cargar_bytes(self, datos, posicion)
+        for mitad in (self.izquierda, self.derecha, self.arriba, self.abajo):
+            posicion = mitad.cargar_bytes(datos, posicion)
+        return posicion
+
+
+# =================================================================
+# 2. CUERPO DE LA SERPIENTE (CuerpoSerpiente)
+# Buffer circular preasignado del tamaño del tablero: la cabeza se
+# agrega moviendo `inicio` hacia atrás y la cola se quita acortando
+# `largo`, los dos en O(1) sin desplazar la lista como insert(0, ...).
+# Al lado guarda cuántos segmentos hay en cada celda y mantiene al día
+# el índice de celdas libres.
+# =================================================================
+class CuerpoSerpiente:
+    def __init__(self, total, libres):
+        self.capacidad = total # Nunca hay más segmentos que celdas en el tablero
+        tipo = tipo_array(total) # Ni una celda ni un contador pasan de `total`
+        self.celdas = array(tipo, [0]) * total # Celdas planas del cuerpo
+        self.ocupacion = array(tipo, [0]) * total # Segmentos por celda (el cuerpo puede pasar por encima de sí mismo)
+        self.libres = libres
+        self.inicio = 0 # Posición de la cabeza dentro de self.celdas
+        self.largo = 0
+
+    def __len__(self):
+        return self.largo
+
+    def __iter__(self):
+        """Recorre las celdas desde la cabeza hasta la cola."""
+        for i in range(self.inicio, self.inicio + self.largo):
+            yield self.celdas[i % self.capacidad]
+
+    def cabeza(self):
+        return self.celdas[self.inicio]
+
+    def cola(self):
+        return self.celdas[(self.inicio + self.largo - 1) % self.capacidad]
+
+    def cuello(self):
+        """Celda del segmento que sigue a la cabeza (con largo 1 es la cabeza misma)."""
+        return self.celdas[(self.inicio + min(1, self.largo - 1)) % self.capacidad]
+
+    def ocupada(self, celda):
+        """Retorna si algún segmento está en la celda, en O(1)."""
+        return self.ocupacion[celda] > 0
+
+    def crecer(self, celda):
+        """Agrega una cabeza nueva sin quitar la cola. Con el buffer lleno solo avanza."""
+        if self.largo == self.capacidad:
+            self.avanzar(celda)
+            return
+        self.inicio = (self.inicio - 1) % self.capacidad
+        self.celdas[self.inicio] = celda
+        self.largo += 1
+        self._ocupar(celda)
+
+    def avanzar(self, celda):
+        """Agrega una cabeza nueva y quita la cola. Retorna la celda de la cola quitada."""
+        # La cola se lee primero: con el buffer lleno la cabeza nueva va en su lugar
+        cola = self.cola()
+        self._liberar(cola)
+        self.inicio = (self.inicio - 1) % self.capacidad
+        self.celdas[self.inicio] = celda
+        self._ocupar(celda)
+        return cola
+
+    def copiar(self):
+        """Retorna las celdas en un array nuevo, la cabeza primero (dos cortes del buffer, sin recorrerlo en Python)."""
+        fin = self.inicio + self.largo
+        if fin <= self.capacidad:
+            return self.celdas[self.inicio:fin]
+        return self.celdas[self.inicio:] + self.celdas[:fin - self.capacidad]
+
+    def a_bytes(self):
+        """Celdas (la cabeza primero) y ocupación de cada celda. El índice de libres se guarda aparte."""
+        return self.copiar().tobytes() + self.ocupacion.tobytes()
+
+    def cargar_bytes(self, datos, posicion, largo):
+        """Carga un cuerpo de `largo` celdas guardado con a_bytes(). Retorna dónde termina."""
+        tamano = self.celdas.itemsize * largo
+        fin = posicion + tamano
+        memoryview(self.celdas).cast('B')[:tamano] = datos[posicion:fin]
+        self.inicio = 0
+        self.largo = largo
+        return _copiar_en(self.ocupacion, datos, fin)
+
+    def _ocupar(self, celda):
+        """Suma un segmento a la celda y la saca del índice de libres si estaba vacía."""
+        if not self.ocupacion[celda]:
+            self.libres.ocupar(celda)
+        self.ocupacion[celda] += 1
+
+    def _liberar(self, celda):
+        """Resta un segmento a la celda y la devuelve al índice de libres si quedó vacía."""
+        self.ocupacion[celda] -= 1
+        if not self.ocupacion[celda]:
+            self.libres.liberar(celda)
+
+
+# =================================================================
+# 3. MECÁNICAS DE LA MANZANA (versión sin pygame)
+# =================================================================
+class MecanicasManzana:
+    def __init__(self, ancho, alto, rng, libres):
+        self.ancho = ancho
+        self.alto = alto
+        self.rng = rng # Generador aleatorio propio (reproducible con la semilla)
+        self.libres = libres # IndiceMitades que el motor mantiene al mover la serpiente
+        self.manzana_x = 0
+        self.manzana_y = 0
+        self.sorteos = 0 # Veces que se usó el generador (el motor sabe así si cambió su estado)
+
+    def colocar_manzana_random(self, direccion_actual):
+        """
+        Coloca la manzana en una celda aleatoria de la mitad del tablero
+        hacia donde se dirige la serpiente, evitando el cuerpo.
+
+        MEJORA: cada mitad del tablero tiene su propio índice de libres
+        (IndiceMitades), que se actualiza al mover la serpiente. Elegir una
+        celda de la "mitad delantera" y saber si está llena son O(1), sin
+        recorrer la cuadrícula ni sortear a ciegas.
+        """
+        self.sorteos += 1
+        mitad = self.libres.mitades[direccion_actual]
+        celda = mitad.elegir(self.rng)
+        if celda is None:
+            self.colocar_manzana_segura() # Respaldo si la mitad delantera está llena
+            return
+
+        self.manzana_x, self.manzana_y = celda % self.ancho, celda // self.ancho
+
+    def colocar_manzana_segura(self):
+        """
+        Método de respaldo: cualquier celda libre del tablero.
+        MEJORA: O(1) con el índice de libres, sin recorrer la cuadrícula.
+        """
+        self.sorteos += 1
+        celda = self.libres.elegir(self.rng)
+        if celda is None:
+            return False # Tablero lleno: la manzana se queda donde está
+
+        self.manzana_x, self.manzana_y = celda % self.ancho, celda // self.ancho
+        return True
+
+    def obtener_coordenadas(self):
+        """Retorna la celda actual (x, y) de la manzana."""
+        return self.manzana_x, self.manzana_y
+
+
+# =================================================================
+# 4. MOTOR DEL JUEGO (MotorSerpiente)
+# =================================================================
+class MotorSerpiente:
+    """
+    Reglas del juego sin ventana ni reloj: reset(semilla), step(direccion)
+    y state(). Cada step() es un tick de juego.
+
+    Con choque_cuerpo=True se juega el modo clásico: chocar con el propio
+    cuerpo termina la partida.
+    """
+    def __init__(self, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO, semilla=None, choque_cuerpo=False):
+        self.ancho = ancho
+        self.alto = alto
+        self.choque_cuerpo = choque_cuerpo
+        self.rng = random.Random()
+        self.reset(semilla)
+
+    def reset(self, semilla=None):
+        """Reinicia la partida. Con la misma semilla se obtiene la misma partida."""
+        if semilla is None:
+            # Se elige una semilla concreta (y no la del sistema) para poder grabar y repetir la partida
+            semilla = random.getrandbits(63)
+        elif isinstance(semilla, bool) or not isinstance(semilla, int) or not 0 <= semilla < LIMITE_SEMILLA:
+            # random.Random aceptaría más (textos, enteros enormes), pero la semilla se guarda en 63 bits
+            raise ValueError(f"La semilla debe ser un entero entre 0 y {LIMITE_SEMILLA - 1}: {semilla!r}")
+        self.semilla = semilla
+        self.rng.seed(semilla)
+        self.rng_empaquetado = None # (sorteos, bytes) del generador en la última foto, ver snapshot()
+
+        # Posición inicial centrada en la cuadrícula
+        inicio_x = (self.ancho - 1) // 2
+        inicio_y = (self.alto - 1) // 2
+
+        self.puntuacion = 0
+        self.ticks = 0
+        self.vivo = True
+        self.direccion_actual = DIRECCION_INICIAL
+        self.giros_pendientes = deque() # Giros ya validados que esperan su tick (uno por tick)
+        self.giro_aplicado = None # Giro de la cola que se aplicó en el último tick
+
+        self.libres = IndiceMitades(self.ancho, self.alto)
+        self.cuerpo = CuerpoSerpiente(self.ancho * self.alto, self.libres)
+        self.cuerpo.crecer(inicio_y * self.ancho + inicio_x)
+        self.cola_anterior = self.cuerpo.cola() # Dónde estaba la cola antes del último tick (para interpolar el dibujo)
+
+        self.mecanicas_manzana = MecanicasManzana(self.ancho, self.alto, self.rng, self.libres)
+        self.mecanicas_manzana.colocar_manzana_random(self.direccion_actual)
+        return self.state()
+
+    def cambiar_direccion(self, nueva_direccion):
+        """Aplica la nueva dirección si no es la opuesta a la actual. Retorna si se aplicó."""
+        dx, dy = self.direccion_actual
+        nx, ny = nueva_direccion
+        # Solo se permiten giros de 90 grados (ej: no puede ir de derecha a izquierda instantáneamente)
+        if (nx == 0 and dy == 0) or (ny == 0 and dx == 0):
+            self.direccion_actual = nueva_direccion
+            return True
+        return False
+
+    def encolar_giro(self, nueva_direccion):
+        """
+        Deja un giro para un próximo tick. Se valida contra el último giro en
+        cola (o la dirección actual), así dos teclas rápidas dentro del mismo
+        tick (ej: arriba y luego izquierda) se aplican en dos ticks seguidos
+        en vez de pisarse. Retorna si se aceptó.
+        """
+        if len(self.giros_pendientes) >= MAX_GIROS_EN_COLA:
+            return False # Cola llena: se descarta la tecla
+        dx, dy = self.giros_pendientes[-1] if self.giros_pendientes else self.direccion_actual
+        nx, ny = nueva_direccion
+        # Solo giros de 90 grados respecto de la dirección que tendrá la serpiente (repetir la misma no suma nada)
+        if (nx == 0 and dy == 0) or (ny == 0 and dx == 0):
+            self.giros_pendientes.append(nueva_direccion)
+            return True
+        return False
+
+    def step(self, direccion=None):
+        """
+        Avanza un tick. Si se pasa una dirección se intenta girar antes de mover;
+        si no, se aplica el próximo giro en cola (como máximo uno por tick).
+        """
+        if not self.vivo:
+            return False
+        self.giro_aplicado = None
+        if direccion is not None:
+            self.cambiar_direccion(direccion)
+        elif self.giros_pendientes:
+            self.giro_aplicado = self.giros_pendientes.popleft()
+            self.cambiar_direccion(self.giro_aplicado)
+        self.vivo = self.mover_serpiente()
+        self.ticks += 1
+        return self.vivo
+
+    def snapshot(self):
+        """
+        Foto de todo el estado de la partida en bytes (formato FOTO): cuerpo,
+        dirección, giros en cola, manzana, puntuación, ticks y generador
+        aleatorio. Sirve para guardar y cargar partidas, para rebobinar (cliente
+        de red) y para que un bot pruebe jugadas. El cuerpo se guarda hasta su
+        largo, pero la ocupación y el índice de libres son arrays del tamaño del
+        tablero que se copian enteros, sin deepcopy: ~18 bytes por celda hasta
+        65535 celdas (unos microsegundos en 40x25) y ~36 en tableros más grandes.
+
+        MEJORA: el generador solo se usa al colocar una manzana, así que su estado
+        empaquetado (lo más caro de la foto) se reusa mientras no haya sorteos nuevos.
+        """
+        manzana = self.mecanicas_manzana
+        if self.rng_empaquetado is None or self.rng_empaquetado[0] != manzana.sorteos:
+            _, palabras, gauss = self.rng.getstate()
+            bloque = array('I', palabras).tobytes() + GAUSS.pack(math.nan if gauss is None else gauss)
+            self.rng_empaquetado = (manzana.sorteos, bloque)
+        manzana_x, manzana_y = manzana.obtener_coordenadas()
+        return b"".join((
+            FOTO.pack(MAGICO_FOTO, VERSION_FOTO, self.ancho, self.alto, self.choque_cuerpo, self.semilla,
+                      self.ticks, self.puntuacion, manzana_y * self.ancho + manzana_x, self.cola_anterior,
+                      CODIGOS[self.direccion_actual], CODIGOS.get(self.giro_aplicado, SIN_DIRECCION), self.vivo,
+                      len(self.giros_pendientes), len(self.cuerpo)),
+            bytes(CODIGOS[direccion] for direccion in self.giros_pendientes),
+            self.rng_empaquetado[1],
+            self.cuerpo.a_bytes(),
+            self.libres.a_bytes(),
+        ))
+
+    def restore(self, foto):
+        """
+        Vuelve al estado de una foto de snapshot(), tomada en este motor o en
+        otro con el mismo tablero (ej: una partida guardada).
+        """
+        (magico, version, ancho, alto, choque, semilla, ticks, puntuacion, manzana, cola_anterior,
+         direccion, giro, vivo, cantidad_giros, largo) = FOTO.unpack_from(foto)
+        if magico != MAGICO_FOTO or version != VERSION_FOTO:
+            raise ValueError("Los datos no son una foto válida del motor")
+        if (ancho, alto) != (self.ancho, self.alto):
+            raise ValueError(f"La foto es de un tablero de {ancho}x{alto}, el motor es de {self.ancho}x{self.alto}")
+
+        posicion = FOTO.size + cantidad_giros
+        bloque = foto[posicion:posicion + TAMANO_RNG]
+        vista = memoryview(foto)
+        posicion = self.cuerpo.cargar_bytes(vista, posicion + TAMANO_RNG, largo)
+        self.libres.cargar_bytes(vista, posicion)
+
+        # Si el generador ya está en ese estado (ej: se vuelve unos ticks atrás sin manzanas de por medio) no se toca
+        sorteos = self.mecanicas_manzana.sorteos
+        if self.rng_empaquetado != (sorteos, bloque):
+            palabras = array('I')
+            palabras.frombytes(bloque[:4 * PALABRAS_RNG])
+            gauss, = GAUSS.unpack_from(bloque, 4 * PALABRAS_RNG)
+            self.rng.setstate((self.rng.VERSION, tuple(palabras), None if math.isnan(gauss) else gauss))
+            self.rng_empaquetado = (sorteos, bytes(bloque))
+        self.choque_cuerpo = bool(choque)
+        self.semilla, self.ticks, self.puntuacion, self.vivo = semilla, ticks, puntuacion, bool(vivo)
+        self.cola_anterior = cola_anterior
+        self.direccion_actual = DIRECCIONES[direccion]
+        self.giro_aplicado = DIRECCIONES[giro] if giro != SIN_DIRECCION else None
+        self.giros_pendientes = deque(DIRECCIONES[codigo] for codigo in foto[FOTO.size:FOTO.size + cantidad_giros])
+        self.mecanicas_manzana.manzana_x, self.mecanicas_manzana.manzana_y = manzana % self.ancho, manzana // self.ancho
+
+    @property
+    def segmentos(self):
+        """Celdas (x, y) de la serpiente, la cabeza primero."""
+        return [(celda % self.ancho, celda // self.ancho) for celda in self.cuerpo]
+
+    def mover_serpiente(self):
+        """Calcula el nuevo movimiento con teletransporte en los bordes."""
+        dx, dy = self.direccion_actual
+        cabeza = self.cuerpo.cabeza()
+        # Celda que deja libre la cola en este tick (si crece, la cola no se mueve y es la misma)
+        self.cola_anterior = self.cuerpo.cola()
+
+        # El módulo de Python siempre es positivo, así que cubre también los bordes izquierdo y superior
+        siguiente_x = (cabeza % self.ancho + dx) % self.ancho
+        siguiente_y = (cabeza // self.ancho + dy) % self.alto
+        nueva_cabeza = siguiente_y * self.ancho + siguiente_x
+        esta_comiendo = (siguiente_x, siguiente_y) == self.mecanicas_manzana.obtener_coordenadas()
+
+        if self.choque_cuerpo and self.chequeo_colision_cuerpo(nueva_cabeza, esta_comiendo):
+            return False # Chocó con su cuerpo: la serpiente no se mueve y el juego termina
+
+        # Crece si la cabeza nueva cae en la manzana; si no, avanza quitando la cola
+        if esta_comiendo:
+            self.cuerpo.crecer(nueva_cabeza)
+        else:
+            self.cuerpo.avanzar(nueva_cabeza)
+
+        self.chequeo_colision_manzana()
+        return True
+
+    def chequeo_colision_cuerpo(self, nueva_cabeza, esta_comiendo):
+        """
+        Verifica si la cabeza nueva choca con el cuerpo en O(1) con el contador de
+        ocupación (antes: nueva_cabeza in self.segmentos[1:], que copiaba y recorría todo).
+        """
+        segmentos_en_celda = self.cuerpo.ocupacion[nueva_cabeza]
+        # La cola se va en este mismo tick si no está comiendo, así que esa celda queda libre
+        if not esta_comiendo and nueva_cabeza == self.cuerpo.cola():
+            segmentos_en_celda -= 1
+        return segmentos_en_celda > 0
+
+    def chequeo_colision_manzana(self):
+        """Verifica si la cabeza está en la celda de la manzana y, si es así, la recoloca."""
+        manzana_x, manzana_y = self.mecanicas_manzana.obtener_coordenadas()
+        if self.cuerpo.cabeza() != manzana_y * self.ancho + manzana_x:
+            return False
+
+        self.puntuacion += 1
+        self.mecanicas_manzana.colocar_manzana_random(self.direccion_actual)
+        return True
+
+    def state(self):
+        """Retorna una foto del estado actual (copias, se puede guardar sin riesgo)."""
+        return {
+            "segmentos": self.segmentos,
+            "direccion": self.direccion_actual,
+            "manzana": self.mecanicas_manzana.obtener_coordenadas(),
+            "puntuacion": self.puntuacion,
+            "ticks": self.ticks,
+            "vivo": self.vivo,
+        }
@@ -0,0 +1,79 @@
+import csv
+import math
+import time
+from array import array
+
+# =================================================================
+# PERFIL DE FASES POR FRAME (PerfilFases)
+# Guarda cuánto tardó cada fase del bucle principal (eventos, lógica,
+# fondo, escena, HUD, flip) en un buffer circular de tamaño fijo: los
+# últimos `capacidad` frames, sin crear objetos por frame. Con eso se
+# calculan p50/p99 por fase para el overlay y se exporta a CSV.
+# =================================================================
+
+
+class PerfilFases:
+    def __init__(self, fases, capacidad=600):
+        self.fases = tuple(fases)
+        self.columna = {fase: i for i, fase in enumerate(self.fases)}
+        self.capacidad = capacidad
+        # Una fila de len(fases) segundos por frame, todo en un solo arreglo plano
+        self.tiempos = array('d', bytes(8 * capacidad * len(self.fases)))
+        self.frames = 0 # Frames completos registrados desde el inicio
+        self.fila = 0 # Donde empieza la fila del frame en curso
+        self.marca = 0.0
+
+    def iniciar_frame(self):
+        """Empieza a medir un frame nuevo (pisa el más viejo si el buffer está lleno)."""
+        n = len(self.fases)
+        self.fila = (self.frames % self.capacidad) * n
+        for i in range(self.fila, self.fila + n):
+            self.tiempos[i] = 0.0
+        self.marca = time.perf_counter()
+
+    def marcar(self, fase):
+        """Suma a `fase` el tiempo transcurrido desde la marca anterior."""
+        ahora = time.perf_counter()
+        self.tiempos[self.fila + self.columna[fase]] += ahora - self.marca
+        self.marca = ahora
+
+    def cerrar_frame(self):
+        self.frames += 1
+
+    def _filas(self):
+        """Índices de inicio de las filas completas, de la más vieja a la más nueva."""
+        n = len(self.fases)
+        cantidad = min(self.frames, self.capacidad)
+        primera = self.frames - cantidad
+        return [((primera + k) % self.capacidad) * n for k in range(cantidad)]
+
+    def percentiles(self, *ps):
+        """Retorna {fase: [segundos por percentil]} sobre los frames guardados (rango más cercano)."""
+        filas = self._filas()
+        resultado = {}
+        for fase, columna in self.columna.items():
+            valores = sorted(self.tiempos[fila + columna] for fila in filas)
+            if not valores:
+                resultado[fase] = [0.0 for _ in ps]
+                continue
+            resultado[fase] = [valores[max(0, math.ceil(p * len(valores)) - 1)] for p in ps]
+        return resultado
+
+    def lineas_overlay(self):
+        """Textos del overlay: p50 y p99 de cada fase en milisegundos."""
+        lineas = [f"{'fase':8} p50 / p99 ms"]
+        for fase, (p50, p99) in self.percentiles(0.50, 0.99).items():
+            lineas.append(f"{fase:8} {p50 * 1000:5.2f} / {p99 * 1000:5.2f}")
+        return lineas
+
+    def guardar_csv(self, ruta):
+        """Escribe los frames guardados en orden (un frame por fila, tiempos en ms)."""
+        n = len(self.fases)
+        filas = self._filas()
+        primera = self.frames - len(filas)
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["frame", *self.fases, "total"])
+            for k, fila in enumerate(filas):
+                tiempos = [self.tiempos[fila + i] * 1000 for i in range(n)]
+                escritor.writerow([primera + k, *(f"{t:.4f}" for t in tiempos), f"{sum(tiempos):.4f}"])
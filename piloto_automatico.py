@@ -0,0 +1,184 @@
+import argparse
+import time
+from array import array
+
+from motor_serpiente import MotorSerpiente, ANCHO_TABLERO, ALTO_TABLERO, DIRECCIONES
+
+# =================================================================
+# PILOTO AUTOMÁTICO (PilotoAutomatico)
+# Busca con BFS el camino más corto de la cabeza a la manzana sin pasar
+# por el cuerpo, en el tablero con teletransporte: los vecinos de cada
+# celda salen del mismo % que usa mover_serpiente. Los buffers (vecinos,
+# marcas de visita, padres, la cola de la búsqueda y el camino) se crean
+# una vez con el tablero y se reusan: un tick no crea listas, dicts ni
+# arrays. En vez de limpiar las marcas entre búsquedas se usa un número
+# de búsqueda distinto cada vez.
+# El camino se sigue paso a paso y solo se vuelve a buscar cuando la
+# manzana cambia, la serpiente se desvía (ej: giró el jugador) o la
+# próxima celda dejó de estar libre. Si no hay camino a la manzana va
+# hacia el vecino libre desde el que se alcanzan más celdas.
+# =================================================================
+SIN_DESTINO = -1
+
+
+class PilotoAutomatico:
+    def __init__(self, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO):
+        self.ancho = ancho
+        self.alto = alto
+        total = ancho * alto
+
+        # vecinos[4 * celda + k] = celda a la que se llega desde `celda` yendo en DIRECCIONES[k]
+        self.vecinos = array('i', bytes(16 * total))
+        for celda in range(total):
+            x, y = celda % ancho, celda // ancho
+            for k, (dx, dy) in enumerate(DIRECCIONES):
+                self.vecinos[4 * celda + k] = ((y + dy) % alto) * ancho + (x + dx) % ancho
+
+        self.marcas = array('I', bytes(4 * total)) # marcas[celda] == self.marca: ya visitada en esta búsqueda
+        self.marca = 0
+        self.padre = array('i', bytes(4 * total)) # Desde qué celda se llegó a cada una
+        self.via = array('b', bytes(total)) # Código de la dirección con que se llegó a cada celda
+        self.cola = array('i', bytes(4 * total)) # Cola de la BFS: cada celda entra una sola vez
+
+        self.camino = array('b', bytes(total)) # Códigos de dirección del camino a la manzana
+        self.largo_camino = 0
+        self.paso = 0 # Próximo paso del camino a seguir
+        self.cabeza_esperada = -1 # Dónde debería estar la cabeza si se siguió el camino
+        self.manzana_camino = -1 # Manzana para la que se buscó el camino
+        self.busquedas = 0
+
+    def elegir(self, motor):
+        """Dirección para pasarle a motor.step() en el próximo tick (None = seguir derecho)."""
+        if not motor.vivo:
+            return None
+        cuerpo = motor.cuerpo
+        cabeza = cuerpo.cabeza()
+        manzana_x, manzana_y = motor.mecanicas_manzana.obtener_coordenadas()
+        manzana = manzana_y * self.ancho + manzana_x
+        # La cola se va en este mismo tick (la manzana nunca está sobre el cuerpo), así que su celda se puede pisar
+        cola = cuerpo.cola() if len(cuerpo) > 1 else -1
+        ocupacion = cuerpo.ocupacion
+
+        if self.paso < self.largo_camino and cabeza == self.cabeza_esperada and manzana == self.manzana_camino:
+            siguiente = self.vecinos[4 * cabeza + self.camino[self.paso]]
+            if ocupacion[siguiente] and siguiente != cola:
+                self.largo_camino = 0 # El camino quedó tapado
+        else:
+            self.largo_camino = 0
+
+        if not self.largo_camino:
+            self.paso = 0
+            self.manzana_camino = manzana
+            if not self._buscar(cabeza, manzana, ocupacion, cola, motor.direccion_actual):
+                return self._escapar(cabeza, ocupacion, cola, motor.direccion_actual, len(cuerpo))
+            self._armar_camino(cabeza, manzana)
+
+        codigo = self.camino[self.paso]
+        self.paso += 1
+        self.cabeza_esperada = self.vecinos[4 * cabeza + codigo]
+        return DIRECCIONES[codigo]
+
+    def _buscar(self, origen, destino, ocupacion, cola_libre, direccion, limite=0):
+        """
+        BFS desde origen sin pasar por celdas ocupadas (salvo cola_libre). Retorna
+        True si llegó a destino; con destino SIN_DESTINO cuenta las celdas
+        alcanzables (corta al llegar a `limite`) y retorna cuántas visitó.
+        """
+        self.busquedas += 1
+        self.marca += 1
+        marca = self.marca
+        marcas = self.marcas
+        padre = self.padre
+        via = self.via
+        cola = self.cola
+        vecinos = self.vecinos
+
+        marcas[origen] = marca
+        # El motor no deja dar la vuelta: la celda de atrás no sirve como primer paso aunque
+        # esté libre (sin cuello, o con largo 2 cuando el cuello es la cola que se va)
+        atras = vecinos[4 * origen + (DIRECCIONES.index(direccion) ^ 1)]
+        marcas[atras] = marca
+        cola[0] = origen
+        leido, escrito = 0, 1
+        while leido < escrito:
+            celda = cola[leido]
+            leido += 1
+            if leido == 2:
+                marcas[atras] = 0 # Después del primer paso sí se puede llegar por otro lado
+            base = 4 * celda
+            for k in (0, 1, 2, 3):
+                vecina = vecinos[base + k]
+                if marcas[vecina] == marca or (ocupacion[vecina] and vecina != cola_libre):
+                    continue
+                marcas[vecina] = marca
+                padre[vecina] = celda
+                via[vecina] = k
+                if vecina == destino:
+                    return True
+                cola[escrito] = vecina
+                escrito += 1
+                if escrito == limite:
+                    return escrito
+        return escrito if destino == SIN_DESTINO else False
+
+    def _armar_camino(self, origen, destino):
+        """Recorre los padres desde la manzana hasta la cabeza y deja los pasos en orden en self.camino."""
+        padre = self.padre
+        largo = 0
+        celda = destino
+        while celda != origen:
+            largo += 1
+            celda = padre[celda]
+        celda = destino
+        for i in range(largo - 1, -1, -1):
+            self.camino[i] = self.via[celda]
+            celda = padre[celda]
+        self.largo_camino = largo
+
+    def _escapar(self, cabeza, ocupacion, cola, direccion, largo):
+        """
+        Sin camino a la manzana: el vecino libre con más espacio alcanzable (None si
+        no hay ninguno). Un espacio donde entra toda la serpiente ya alcanza.
+        """
+        opuesta = DIRECCIONES.index(direccion) ^ 1
+        mejor, mejor_espacio = None, 0
+        for k in (0, 1, 2, 3):
+            vecina = self.vecinos[4 * cabeza + k]
+            if k == opuesta or (ocupacion[vecina] and vecina != cola):
+                continue
+            # La cabeza actual cuenta como ocupada durante la búsqueda del espacio
+            espacio = self._buscar(vecina, SIN_DESTINO, ocupacion, cola, DIRECCIONES[k], largo + 1)
+            if espacio > mejor_espacio:
+                mejor, mejor_espacio = k, espacio
+            if espacio > largo:
+                break
+        return DIRECCIONES[mejor] if mejor is not None else None
+
+
+def jugar(partidas, ticks, ancho, alto, choque_cuerpo=True):
+    """Corre partidas sin ventana con el piloto y retorna (ticks jugados, segundos, puntuaciones)."""
+    piloto = PilotoAutomatico(ancho, alto)
+    total_ticks = 0
+    puntuaciones = []
+    inicio = time.perf_counter()
+    for semilla in range(partidas):
+        motor = MotorSerpiente(ancho, alto, semilla, choque_cuerpo)
+        while motor.ticks < ticks and motor.step(piloto.elegir(motor)):
+            pass
+        total_ticks += motor.ticks
+        puntuaciones.append(motor.puntuacion)
+    return total_ticks, time.perf_counter() - inicio, puntuaciones
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Piloto automático del Snake (BFS en el tablero con teletransporte)")
+    parser.add_argument("--partidas", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=5000, help="ticks como máximo por partida")
+    parser.add_argument("--tablero", default=f"{ANCHO_TABLERO}x{ALTO_TABLERO}", metavar="ANCHOxALTO")
+    argumentos = parser.parse_args()
+
+    ancho, alto = (int(n) for n in argumentos.tablero.lower().split("x"))
+    ticks, segundos, puntuaciones = jugar(argumentos.partidas, argumentos.ticks, ancho, alto)
+    print(f"{argumentos.partidas} partidas en {ancho}x{alto} (modo choque): {ticks} ticks en {segundos:.2f} s "
+          f"({ticks / segundos:,.0f} ticks/s)")
+    print(f"  Puntuaciones: {puntuaciones}")
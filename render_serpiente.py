@@ -0,0 +1,413 @@
+import os
+import pygame
+from collections import OrderedDict
+
+# =================================================================
+# AYUDANTES DE DIBUJO PARA EL FRONT-END DE PYGAME
+# Trabajan sobre un JuegoSerpiente de EfiS.py (motor + funciones de
+# dibujo) y sobre la pantalla ya creada en principal().
+# =================================================================
+
+
+# =================================================================
+# 1. CACHÉ DE TEXTO (CacheTexto)
+# pygame.font.Font(None, 36) lee la fuente del disco y la prepara con
+# FreeType cada vez que se llama. Aquí la fuente se carga una sola vez
+# y cada texto ya dibujado (con su caja redondeada) se guarda por
+# string en un LRU acotado: solo se vuelve a renderizar cuando el
+# texto cambia (la puntuación o el segundo que se muestra).
+# =================================================================
+COLOR_CLAVE = (255, 0, 255) # Color transparente de las esquinas de la caja (no aparece en el texto)
+
+
+class CacheTexto:
+    def __init__(self, tamano_fuente=36, color_texto=(255, 255, 255), color_caja=(51, 51, 51), capacidad=64):
+        self.fuente = pygame.font.Font(None, tamano_fuente) # Se carga una sola vez
+        self.color_texto = color_texto
+        self.color_caja = color_caja
+        self.capacidad = capacidad
+        self.superficies = OrderedDict() # texto -> Surface, el más usado al final
+
+    def caja(self, texto):
+        """Retorna la superficie con la caja redondeada y el texto (margen de 5 px)."""
+        superficie = self.superficies.get(texto)
+        if superficie is not None:
+            self.superficies.move_to_end(texto)
+            return superficie
+
+        render = self.fuente.render(texto, True, self.color_texto)
+        superficie = pygame.Surface((render.get_width() + 10, render.get_height() + 10))
+        superficie.fill(COLOR_CLAVE)
+        pygame.draw.rect(superficie, self.color_caja, superficie.get_rect(), border_radius=5)
+        superficie.blit(render, (5, 5))
+        superficie.set_colorkey(COLOR_CLAVE) # Las esquinas redondeadas dejan ver el fondo
+
+        self.superficies[texto] = superficie
+        if len(self.superficies) > self.capacidad:
+            self.superficies.popitem(last=False) # Descarta el menos usado
+        return superficie
+
+
+# =================================================================
+# 2. SPRITES PRE-RENDERIZADOS (SpritesSerpiente)
+# Las baldosas de cabeza, cuerpo y manzana se dibujan una sola vez.
+# Toda la serpiente se envía en una sola llamada a Surface.blits (o
+# fblits si existe, en pygame-ce) con una lista de (baldosa, posición)
+# que se reutiliza entre frames, sin crear un pygame.Rect por segmento.
+# =================================================================
+class SpritesSerpiente:
+    def __init__(self, ancho, alto, tamano, imagen_cabeza, color_cabeza, color_cuerpo, color_manzana):
+        self.ancho = ancho
+        self.alto = alto
+        self.tamano = tamano
+
+        # Baldosas (se dibujan una vez)
+        self.cuerpo = pygame.Surface((tamano, tamano))
+        self.cuerpo.fill(color_cuerpo)
+        if imagen_cabeza:
+            self.cabeza = imagen_cabeza
+        else:
+            self.cabeza = pygame.Surface((tamano, tamano))
+            self.cabeza.fill(color_cabeza)
+        self.manzana = pygame.Surface((tamano, tamano))
+        self.manzana.fill(COLOR_CLAVE)
+        pygame.draw.circle(self.manzana, color_manzana, (tamano // 2, tamano // 2), tamano // 2 - 2)
+        self.manzana.set_colorkey(COLOR_CLAVE)
+
+        # Pares (baldosa de cuerpo, posición) por celda, creados la primera vez que se usan
+        self.pares_cuerpo = [None] * (ancho * alto)
+        self.lote = [] # Lista reutilizada que se pasa a blits
+        self._blits = getattr(pygame.Surface, "fblits", None)
+
+    def posicion(self, celda):
+        return ((celda % self.ancho) * self.tamano, (celda // self.ancho) * self.tamano)
+
+    def _par_cuerpo(self, celda):
+        par = self.pares_cuerpo[celda]
+        if par is None:
+            par = self.pares_cuerpo[celda] = (self.cuerpo, self.posicion(celda))
+        return par
+
+    def dibujar_serpiente(self, superficie, cuerpo):
+        """Dibuja todo el cuerpo (la cabeza primero) con una sola llamada de blits."""
+        self._preparar_lote(len(cuerpo))
+        lote = self.lote
+        for i, celda in enumerate(cuerpo):
+            lote[i] = self._par_cuerpo(celda)
+        lote[0] = (self.cabeza, lote[0][1]) # La cabeza se dibuja primero y el cuerpo encima
+        self._enviar_lote(superficie)
+
+    def dibujar_serpiente_interpolada(self, superficie, cuerpo, cola_anterior, alfa):
+        """
+        Dibuja cada segmento a una fracción `alfa` del camino entre su celda del tick
+        anterior y la actual. En el tick anterior cada segmento estaba donde hoy está
+        el siguiente, y la cola donde estaba `cola_anterior`.
+        """
+        self._preparar_lote(len(cuerpo))
+        lote = self.lote
+        i = -1
+        anterior = None
+        for celda in cuerpo:
+            if anterior is not None:
+                lote[i] = (self.cuerpo, self._interpolar(celda, anterior, alfa))
+            anterior = celda
+            i += 1
+        lote[i] = (self.cuerpo, self._interpolar(cola_anterior, anterior, alfa))
+        lote[0] = (self.cabeza, lote[0][1])
+        self._enviar_lote(superficie)
+
+    def dibujar_serpiente_puntas(self, superficie, cuerpo, cola_anterior, alfa):
+        """
+        Dibuja el cuerpo quieto en sus celdas y desliza solo las puntas (ver
+        posiciones_puntas). Entre un frame y el siguiente cambian solo las celdas de
+        la cabeza, el cuello, la cola y la cola anterior: así el renderizador de
+        rects sucios puede interpolar repintando unas pocas celdas.
+        """
+        largo = len(cuerpo)
+        self._preparar_lote(largo + 1)
+        lote = self.lote
+        i = 0
+        for celda in cuerpo:
+            lote[i] = self._par_cuerpo(celda)
+            i += 1
+        cola, cabeza = self.posiciones_puntas(cuerpo, cola_anterior, alfa)
+        lote[0] = (self.cuerpo, cola) # En lugar de la cabeza quieta: la cola deslizándose, debajo del cuerpo
+        lote[largo] = (self.cabeza, cabeza) # La cabeza va arriba de todo
+        self._enviar_lote(superficie)
+
+    def dibujar_puntas(self, superficie, cuerpo, cola_anterior, alfa):
+        """Dibuja solo la cola y la cabeza deslizándose (el resto del cuerpo ya está en pantalla)."""
+        cola, cabeza = self.posiciones_puntas(cuerpo, cola_anterior, alfa)
+        superficie.blit(self.cuerpo, cola)
+        superficie.blit(self.cabeza, cabeza)
+
+    def posiciones_puntas(self, cuerpo, cola_anterior, alfa):
+        """
+        Posiciones en píxeles de la cola, que sale de la celda que dejó en el último
+        tick, y de la cabeza, que entra a su celda desde la del cuello (o desde la
+        cola anterior si la serpiente es solo la cabeza), a una fracción `alfa` del tick.
+        """
+        cabeza = cuerpo.cabeza()
+        desde = cuerpo.cuello() if len(cuerpo) > 1 else cola_anterior
+        return self._interpolar(cola_anterior, cuerpo.cola(), alfa), self._interpolar(desde, cabeza, alfa)
+
+    def _interpolar(self, desde, hasta, alfa):
+        """Posición en píxeles entre dos celdas vecinas (cruzando el borde si hubo teletransporte)."""
+        x0, y0 = desde % self.ancho, desde // self.ancho
+        x1, y1 = hasta % self.ancho, hasta // self.ancho
+        dx, dy = x1 - x0, y1 - y0
+        # Un paso nunca es de más de una celda: una diferencia mayor es el salto del teletransporte
+        if dx > 1:
+            dx -= self.ancho
+        elif dx < -1:
+            dx += self.ancho
+        if dy > 1:
+            dy -= self.alto
+        elif dy < -1:
+            dy += self.alto
+        return (round((x0 + dx * alfa) * self.tamano), round((y0 + dy * alfa) * self.tamano))
+
+    def _preparar_lote(self, largo):
+        """Ajusta la lista reutilizable al largo de la serpiente sin crear una nueva."""
+        lote = self.lote
+        if len(lote) > largo:
+            del lote[largo:]
+        else:
+            lote.extend([None] * (largo - len(lote)))
+
+    def _enviar_lote(self, superficie):
+        if self._blits:
+            self._blits(superficie, self.lote)
+        else:
+            superficie.blits(self.lote, doreturn=False)
+
+    def dibujar_segmento(self, superficie, x, y, es_cabeza):
+        """Dibuja un solo segmento en la posición en píxeles (x, y)."""
+        superficie.blit(self.cabeza if es_cabeza else self.cuerpo, (x, y))
+
+    def dibujar_manzana(self, superficie, x, y):
+        """Dibuja la manzana en la posición en píxeles (x, y)."""
+        superficie.blit(self.manzana, (x, y))
+
+
+# =================================================================
+# 3. RENDERIZADOR DE RECTÁNGULOS SUCIOS (RenderizadorRectsSucios)
+# En cada tick solo cambian la cabeza, la cola, la manzana y la caja
+# de puntuación. En vez de repintar toda la ventana y llamar a
+# pygame.display.flip(), se repintan esas celdas y se actualizan con
+# pygame.display.update(rects).
+# Con interpolación el cuerpo queda quieto y solo se deslizan las
+# puntas (SpritesSerpiente.dibujar_serpiente_puntas): en cada frame se
+# repintan las celdas de la cabeza, el cuello, la cola y la cola
+# anterior, unas pocas celdas en vez de toda la ventana.
+# El overlay del perfil es otra zona como la caja de puntuación: se
+# repinta cuando cambian sus líneas o cuando algo dibujado lo tocó.
+# =================================================================
+def _sin_perfil(fase):
+    pass
+
+
+class RenderizadorRectsSucios:
+    def __init__(self, pantalla, tamano, color_fondo, dibujar_overlay=None):
+        self.pantalla = pantalla
+        self.tamano = tamano # TAMANO_ELEMENTO: lado de una celda en píxeles
+        self.color_fondo = color_fondo
+        self.dibujar_overlay = dibujar_overlay # (superficie, lineas) -> rect ocupado
+        self.celdas_anteriores = set()
+        self.puntuacion_anterior = None
+        self.rect_puntuacion = pygame.Rect(0, 0, 0, 0)
+        self.overlay_anterior = None # Líneas que hay en pantalla (None = oculto)
+        self.rect_overlay = pygame.Rect(0, 0, 0, 0)
+        self.tick_anterior = 0
+        self.alfa_anterior = None
+        self.rects_puntas = [] # Dónde quedaron las puntas deslizándose (cruzando un borde salen del tablero)
+        self.invalidar()
+
+    def invalidar(self):
+        """Fuerza un repintado completo en el próximo frame (ej: la ventana se tapó y destapó)."""
+        self.repintar_todo = True
+
+    def dibujar(self, juego, alfa=None, perfil=None, overlay=None):
+        """
+        Dibuja el frame actual y actualiza solo lo necesario en la pantalla.
+        Con alfa (0 a 1, cuánto del tick siguiente ya pasó) las puntas de la
+        serpiente se deslizan. Con perfil (PerfilFases) el tiempo se reparte en
+        las fases fondo, escena, hud y flip. overlay son las líneas del perfil a
+        mostrar (se compara la lista por identidad: una lista nueva se repinta).
+        Retorna si dibujó algo.
+        """
+        motor = juego.motor
+        marcar = perfil.marcar if perfil else _sin_perfil
+        if (not self.repintar_todo and motor.ticks == self.tick_anterior and alfa == self.alfa_anterior
+                and overlay is self.overlay_anterior):
+            marcar("escena")
+            return False # Frame sin cambios: la pantalla ya está al día
+        # Si pasó más de un tick desde el último frame no se conocen las colas intermedias
+        if self.repintar_todo or motor.ticks - self.tick_anterior > 1:
+            self.pantalla.fill(self.color_fondo)
+            marcar("fondo")
+            juego.dibujar_tablero(self.pantalla, alfa, puntas=True)
+            marcar("escena")
+            self.rect_puntuacion = juego.dibujar_puntuacion(self.pantalla)
+            self.rect_overlay = self._dibujar_overlay(overlay)
+            marcar("hud")
+            pygame.display.flip()
+            self.repintar_todo = False
+        else:
+            pygame.display.update(self._dibujar_cambios(juego, alfa, overlay, marcar))
+        marcar("flip")
+
+        # Se guarda lo que hay en pantalla para saber qué borrar en el próximo frame
+        self.tick_anterior = motor.ticks
+        self.alfa_anterior = alfa
+        self.overlay_anterior = overlay
+        self.puntuacion_anterior = motor.puntuacion
+        self.celdas_anteriores = self._celdas_actuales(motor, alfa)
+        self.rects_puntas = self._rects_puntas(juego, alfa)
+        return True
+
+    def _celdas_actuales(self, motor, alfa):
+        manzana_x, manzana_y = motor.mecanicas_manzana.obtener_coordenadas()
+        celdas = {motor.cuerpo.cabeza(), motor.cuerpo.cola(), manzana_y * motor.ancho + manzana_x}
+        if alfa is not None:
+            # Las puntas deslizándose tocan también la celda del cuello y la que dejó la cola
+            celdas.add(motor.cuerpo.cuello())
+            celdas.add(motor.cola_anterior)
+        return celdas
+
+    def _rects_puntas(self, juego, alfa):
+        if alfa is None:
+            return []
+        motor = juego.motor
+        return [pygame.Rect(posicion, (self.tamano, self.tamano))
+                for posicion in juego.sprites.posiciones_puntas(motor.cuerpo, motor.cola_anterior, alfa)]
+
+    def _rect_celda(self, motor, celda):
+        x, y = celda % motor.ancho, celda // motor.ancho
+        return pygame.Rect(x * self.tamano, y * self.tamano, self.tamano, self.tamano)
+
+    def _dibujar_overlay(self, overlay):
+        if overlay is None or self.dibujar_overlay is None:
+            return pygame.Rect(0, 0, 0, 0)
+        return self.dibujar_overlay(self.pantalla, overlay)
+
+    def _dibujar_cambios(self, juego, alfa, overlay, marcar):
+        """Repinta las celdas que cambiaron desde el frame anterior y retorna sus rects."""
+        motor = juego.motor
+        celdas = self._celdas_actuales(motor, alfa) | self.celdas_anteriores
+        rects = [self._rect_celda(motor, celda) for celda in celdas]
+        # Una punta que cruza el borde se dibuja en parte fuera del tablero: esa zona también se borra
+        rects += self.rects_puntas + self._rects_puntas(juego, alfa)
+
+        # La caja de puntuación y el overlay van encima de todo: se repintan si cambió
+        # su texto o si algo dibujado debajo los tocó (y uno arrastra al otro si se tapan)
+        puntuacion = motor.puntuacion != self.puntuacion_anterior or self.rect_puntuacion.collidelist(rects) != -1
+        overlay_sucio = overlay is not self.overlay_anterior or self.rect_overlay.collidelist(rects) != -1
+        if self.rect_puntuacion.colliderect(self.rect_overlay):
+            puntuacion = overlay_sucio = puntuacion or overlay_sucio
+        zonas = []
+        if puntuacion:
+            zonas.append(self.rect_puntuacion)
+        if overlay_sucio:
+            zonas.append(self.rect_overlay)
+
+        for rect in rects + zonas:
+            self.pantalla.fill(self.color_fondo, rect)
+        marcar("fondo")
+        for zona in zonas:
+            celdas.update(self._celdas_bajo(motor, zona))
+        for celda in celdas:
+            self._dibujar_celda(juego, celda, alfa)
+        if alfa is not None:
+            juego.sprites.dibujar_puntas(self.pantalla, motor.cuerpo, motor.cola_anterior, alfa)
+        marcar("escena")
+
+        if puntuacion:
+            zona = self.rect_puntuacion
+            self.rect_puntuacion = juego.dibujar_puntuacion(self.pantalla)
+            rects.append(zona.union(self.rect_puntuacion))
+        if overlay_sucio:
+            zona = self.rect_overlay
+            self.rect_overlay = self._dibujar_overlay(overlay)
+            rects += [zona, self.rect_overlay] # Sin unir: al mostrarlo u ocultarlo uno es vacío, en (0, 0)
+        marcar("hud")
+
+        return rects
+
+    def _celdas_bajo(self, motor, zona):
+        """Celdas que tocan el rectángulo `zona` (la caja de puntuación, unas pocas celdas)."""
+        ultima_x = min((zona.right - 1) // self.tamano, motor.ancho - 1)
+        ultima_y = min((zona.bottom - 1) // self.tamano, motor.alto - 1)
+        for y in range(zona.top // self.tamano, ultima_y + 1):
+            for x in range(zona.left // self.tamano, ultima_x + 1):
+                yield y * motor.ancho + x
+
+    def _dibujar_celda(self, juego, celda, alfa=None):
+        """
+        Dibuja lo que haya en la celda (manzana y/o segmento) sobre el fondo ya repintado.
+        Con alfa la cabeza no se dibuja quieta: la agrega dibujar_puntas.
+        """
+        motor = juego.motor
+        x, y = celda % motor.ancho, celda // motor.ancho
+        if (x, y) == motor.mecanicas_manzana.obtener_coordenadas():
+            juego.dibujar_manzana(self.pantalla)
+        segmentos_en_celda = motor.cuerpo.ocupacion[celda]
+        if segmentos_en_celda:
+            # Si el cuerpo pasa por encima de la cabeza, el cuerpo se dibuja arriba (como en dibujar_serpiente)
+            es_cabeza = celda == motor.cuerpo.cabeza() and segmentos_en_celda == 1
+            if es_cabeza and alfa is not None:
+                return
+            juego.dibujar_segmento(self.pantalla, x * self.tamano, y * self.tamano, es_cabeza)
+
+
+# =================================================================
+# 4. FONDO EN MOVIMIENTO (FondoDesplazable)
+# Antes se escalaba la imagen al doble del ancho de la ventana y se
+# dibujaba dos veces por frame, aunque solo la mitad izquierda llegaba
+# a verse. Aquí se guarda una sola textura del tamaño de la ventana y
+# se copian solo las dos franjas visibles. La textura ya convertida y
+# escalada se guarda en disco, así el próximo arranque no decodifica
+# el PNG ni lo vuelve a escalar.
+# =================================================================
+class FondoDesplazable:
+    def __init__(self, ruta, ancho, alto, velocidad, dir_cache=".cache"):
+        self.ancho = ancho
+        self.alto = alto
+        self.velocidad = velocidad
+        self.desplazamiento = 0.0 # En píxeles, con decimales (VELOCIDAD_FONDO puede ser 0.5)
+        self.textura = self._cargar(ruta, dir_cache) # Lanza pygame.error si no se encuentra la imagen
+
+    def _cargar(self, ruta, dir_cache):
+        """Lee la textura del caché en disco o, si no está al día, la arma desde la imagen."""
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        ruta_cache = os.path.join(dir_cache, f"{nombre}.{self.ancho}x{self.alto}.rgb")
+        try:
+            if os.path.getmtime(ruta_cache) >= os.path.getmtime(ruta):
+                with open(ruta_cache, "rb") as archivo:
+                    # Bytes RGB crudos: sin decodificar ni escalar
+                    return pygame.image.frombytes(archivo.read(), (self.ancho, self.alto), "RGB").convert()
+        except (OSError, ValueError):
+            pass # No hay caché (o está incompleto): se arma de nuevo
+
+        imagen = pygame.image.load(ruta).convert()
+        # Mismo resultado que antes: la mitad izquierda de la imagen escalada al doble de ancho
+        doble = pygame.transform.scale(imagen, (self.ancho * 2, self.alto))
+        textura = doble.subsurface((0, 0, self.ancho, self.alto)).copy()
+        try:
+            os.makedirs(dir_cache, exist_ok=True)
+            with open(ruta_cache, "wb") as archivo:
+                archivo.write(pygame.image.tobytes(textura, "RGB"))
+        except OSError:
+            pass # Sin permiso de escritura: se usa la textura igual, solo que sin caché
+        return textura
+
+    def avanzar(self, pasos=1.0):
+        """Mueve el fondo a la izquierda VELOCIDAD_FONDO píxeles por paso (acumula los decimales)."""
+        self.desplazamiento = (self.desplazamiento + self.velocidad * pasos) % self.ancho
+
+    def dibujar(self, superficie):
+        """Copia las dos franjas visibles de la textura (la que sale por la izquierda y la que entra por la derecha)."""
+        corte = int(self.desplazamiento)
+        superficie.blit(self.textura, (0, 0), (corte, 0, self.ancho - corte, self.alto))
+        if corte:
+            superficie.blit(self.textura, (self.ancho - corte, 0), (0, 0, corte, self.alto))
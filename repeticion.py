@@ -0,0 +1,105 @@
+import struct
+import sys
+import time
+
+from motor_serpiente import MotorSerpiente, DIRECCIONES, CODIGOS
+
+# =================================================================
+# GRABACIÓN Y REPETICIÓN DE PARTIDAS
+# El motor es determinista: con la semilla y los giros aceptados (con
+# el número de tick en que ocurrieron) se vuelve a jugar exactamente la
+# misma partida, sin ventana y a toda velocidad.
+#
+# Formato binario (little endian):
+#   cabecera: "SNKR", versión, ancho, alto, modo choque, semilla,
+#             ticks jugados, puntuación final, cantidad de giros
+#   giros:    (tick uint32, dirección uint8) por cada giro aceptado
+# =================================================================
+
+MAGICO = b"SNKR"
+VERSION = 4 # Sube cuando cambia cómo el motor usa el azar: una grabación vieja ya no se repetiría igual
+CABECERA = struct.Struct("<4sBHHBqIII")
+GIRO = struct.Struct("<IB")
+
+
+class GrabadorPartida:
+    """Va guardando los giros aceptados de una partida de MotorSerpiente."""
+    def __init__(self, motor):
+        self.motor = motor
+        self.giros = bytearray()
+        self.cantidad = 0
+
+    def registrar(self, direccion, tick=None):
+        """
+        Registra un giro que el motor acaba de aceptar (se aplica en el próximo tick).
+        Con `tick` se indica en qué tick se aplicó (ej: un giro que salió de la cola).
+        """
+        self.giros += GIRO.pack(self.motor.ticks if tick is None else tick, CODIGOS[direccion])
+        self.cantidad += 1
+
+    def a_bytes(self):
+        """Partida completa hasta el tick actual en formato binario."""
+        motor = self.motor
+        cabecera = CABECERA.pack(MAGICO, VERSION, motor.ancho, motor.alto, motor.choque_cuerpo,
+                                 motor.semilla, motor.ticks, motor.puntuacion, self.cantidad)
+        return cabecera + bytes(self.giros)
+
+    def guardar(self, ruta):
+        with open(ruta, "wb") as archivo:
+            archivo.write(self.a_bytes())
+
+
+def leer(datos):
+    """Decodifica una grabación. Retorna (cabecera como dict, lista de (tick, dirección))."""
+    magico, version, ancho, alto, choque, semilla, ticks, puntuacion, cantidad = CABECERA.unpack_from(datos)
+    if magico != MAGICO or version != VERSION:
+        raise ValueError("El archivo no es una grabación de partida válida")
+
+    cabecera = {
+        "ancho": ancho,
+        "alto": alto,
+        "choque_cuerpo": bool(choque),
+        "semilla": semilla,
+        "ticks": ticks,
+        "puntuacion": puntuacion,
+    }
+    giros = [(tick, DIRECCIONES[codigo]) for tick, codigo in GIRO.iter_unpack(datos[CABECERA.size:CABECERA.size + cantidad * GIRO.size])]
+    return cabecera, giros
+
+
+def reproducir(datos):
+    """Vuelve a jugar la partida grabada sin ventana ni espera. Retorna (motor al final, cabecera)."""
+    cabecera, giros = leer(datos)
+    motor = MotorSerpiente(cabecera["ancho"], cabecera["alto"], cabecera["semilla"], cabecera["choque_cuerpo"])
+
+    siguiente = 0
+    for tick in range(cabecera["ticks"]):
+        # Aplica los giros que se hicieron antes de este tick
+        while siguiente < len(giros) and giros[siguiente][0] == tick:
+            motor.cambiar_direccion(giros[siguiente][1])
+            siguiente += 1
+        motor.step()
+
+    return motor, cabecera
+
+
+def verificar(datos):
+    """Retorna True si al repetir la partida se llega a la misma puntuación grabada."""
+    motor, cabecera = reproducir(datos)
+    return motor.puntuacion == cabecera["puntuacion"]
+
+
+if __name__ == '__main__':
+    # Uso: python repeticion.py partida.snkr
+    with open(sys.argv[1], "rb") as archivo:
+        datos = archivo.read()
+
+    inicio = time.perf_counter()
+    motor, cabecera = reproducir(datos)
+    duracion = time.perf_counter() - inicio
+
+    print(f"Ticks: {motor.ticks}  Puntuación: {motor.puntuacion} (grabada: {cabecera['puntuacion']})")
+    print(f"Repetida en {duracion * 1000:.1f} ms")
+    if motor.puntuacion != cabecera["puntuacion"]:
+        print("ERROR: la repetición no coincide con la partida grabada")
+        sys.exit(1)
@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import random
+import struct
+import time
+from collections import deque
+
+from motor_serpiente import MotorSerpiente, ANCHO_TABLERO, ALTO_TABLERO, MAX_GIROS_EN_COLA, DIRECCIONES, CODIGOS
+
+# =================================================================
+# SERVIDOR DE JUEGO AUTORITATIVO (asyncio, TCP)
+# Un solo proceso corre el bucle de ticks de muchas partidas (una por
+# cliente conectado). Los clientes solo mandan giros, cada uno con el
+# tick en que quieren aplicarlo; el servidor lo aplica en ese tick (o en
+# el primero libre si llegó tarde) y en cada tick manda a cada cliente
+# solo lo que cambió: nueva cabeza, cola quitada, la manzana nueva si se
+# comió y qué giro aplicó. Al conectarse el cliente recibe una vez el
+# estado completo, con la semilla: el motor es determinista, así que el
+# cliente puede simular la partida por su cuenta (ver cliente_red.py).
+#
+# Mensajes (little endian, sin separadores: el tipo define el largo):
+#   GIRO (cliente -> servidor): código de dirección (repeticion.CODIGOS), tick
+#   ESTADO: tipo, tick, ancho, alto, ticks/s, semilla, choque, puntuación, largo, manzana
+#           + largo celdas uint32 (cabeza primero)
+#   DELTA:  tipo, tick, cabeza, cola quitada (-1 si creció), manzana nueva (-1 si no se movió),
+#           giro del tick (código, SIN_GIRO o GIRO_RECHAZADO)
+#   FIN:    tipo, tick (la serpiente chocó, solo en modo choque)
+# Las celdas son índices planos y * ancho + x, como en el motor.
+# =================================================================
+TIPO_ESTADO = 1
+TIPO_DELTA = 2
+TIPO_FIN = 3
+GIRO = struct.Struct("<BI")
+ESTADO = struct.Struct("<BIHHHQBIIi")
+DELTA = struct.Struct("<BIIiiB")
+FIN = struct.Struct("<BI")
+SIN_GIRO = 255 # En el tick no había giro pedido
+GIRO_RECHAZADO = 254 # Se usó el giro pedido pero no era de 90 grados (la serpiente siguió derecho)
+
+TICKS_POR_SEGUNDO = 10
+MAX_BUFFER_CLIENTE = 64 * 1024 # Un cliente que no lee (más de esto pendiente) se desconecta
+MAX_GIROS_CLIENTE = 4 * MAX_GIROS_EN_COLA # Giros sin aplicar por cliente; los que sobran se descartan
+MAX_ADELANTO_GIRO = 64 # Un giro pedido para más adelante que esto se aplica cuanto antes
+
+
+def mensaje_estado(motor, ticks_por_segundo=TICKS_POR_SEGUNDO):
+    """Estado completo de una partida (se manda al conectarse)."""
+    manzana_x, manzana_y = motor.mecanicas_manzana.obtener_coordenadas()
+    celdas = list(motor.cuerpo)
+    return (ESTADO.pack(TIPO_ESTADO, motor.ticks, motor.ancho, motor.alto, ticks_por_segundo, motor.semilla,
+                        motor.choque_cuerpo, motor.puntuacion, len(celdas), manzana_y * motor.ancho + manzana_x)
+            + struct.pack(f"<{len(celdas)}I", *celdas))
+
+
+class PartidaRemota:
+    """Una partida del servidor: el motor, la conexión del jugador y sus giros pedidos."""
+    def __init__(self, motor, escritor):
+        self.motor = motor
+        self.escritor = escritor
+        self.giros = deque() # (tick pedido, dirección) en el orden en que llegaron
+
+    def pedir_giro(self, direccion, tick):
+        if len(self.giros) < MAX_GIROS_CLIENTE:
+            self.giros.append((min(tick, self.motor.ticks + MAX_ADELANTO_GIRO), direccion))
+
+    def avanzar(self):
+        """Avanza un tick (con como máximo un giro pedido) y retorna el mensaje con lo que cambió."""
+        motor = self.motor
+        largo = len(motor.cuerpo)
+        manzana = motor.mecanicas_manzana.obtener_coordenadas()
+
+        # El giro va en el tick que pidió el cliente, o en este si ese tick ya pasó
+        giro = SIN_GIRO
+        direccion = None
+        if self.giros and self.giros[0][0] <= motor.ticks:
+            direccion = self.giros.popleft()[1]
+            giro = CODIGOS[direccion] if motor.cambiar_direccion(direccion) else GIRO_RECHAZADO
+
+        if not motor.step():
+            return FIN.pack(TIPO_FIN, motor.ticks)
+
+        cola = -1 if len(motor.cuerpo) > largo else motor.cola_anterior
+        nueva_manzana = motor.mecanicas_manzana.obtener_coordenadas()
+        celda_manzana = -1 if nueva_manzana == manzana else nueva_manzana[1] * motor.ancho + nueva_manzana[0]
+        return DELTA.pack(TIPO_DELTA, motor.ticks, motor.cuerpo.cabeza(), cola, celda_manzana, giro)
+
+
+class ServidorSerpiente:
+    def __init__(self, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO, ticks_por_segundo=TICKS_POR_SEGUNDO, choque_cuerpo=False):
+        self.ancho = ancho
+        self.alto = alto
+        self.ticks_por_segundo = ticks_por_segundo
+        self.choque_cuerpo = choque_cuerpo
+        self.partidas = {} # escritor -> PartidaRemota
+        self.conexiones = set() # Tareas que atienden a cada cliente
+        self.costos_tick = deque(maxlen=1000) # Segundos de CPU de los últimos ticks (todas las partidas)
+
+    async def iniciar(self, host="127.0.0.1", puerto=8765):
+        """Abre el puerto y arranca el bucle de ticks. Retorna el asyncio.Server."""
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        self.tarea_ticks = asyncio.get_running_loop().create_task(self._bucle_ticks())
+        return self.servidor
+
+    async def cerrar(self):
+        self.tarea_ticks.cancel()
+        self.servidor.close()
+        for escritor in list(self.partidas):
+            escritor.close()
+        for tarea in self.conexiones:
+            tarea.cancel()
+        await asyncio.gather(*self.conexiones, return_exceptions=True)
+        await self.servidor.wait_closed()
+
+    async def _atender(self, lector, escritor):
+        """Una conexión: manda el estado inicial y guarda los giros que lleguen."""
+        partida = PartidaRemota(MotorSerpiente(self.ancho, self.alto, None, self.choque_cuerpo), escritor)
+        self.partidas[escritor] = partida
+        tarea = asyncio.current_task()
+        self.conexiones.add(tarea)
+        escritor.write(mensaje_estado(partida.motor, self.ticks_por_segundo))
+        try:
+            while True:
+                codigo, tick = GIRO.unpack(await lector.readexactly(GIRO.size))
+                if codigo < len(DIRECCIONES):
+                    partida.pedir_giro(DIRECCIONES[codigo], tick)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass # El cliente se fue o el servidor se está cerrando
+        finally:
+            self._desconectar(escritor)
+            self.conexiones.discard(tarea)
+
+    def _desconectar(self, escritor):
+        if self.partidas.pop(escritor, None) is not None:
+            escritor.close()
+
+    async def _bucle_ticks(self):
+        """Paso fijo: cada 1/ticks_por_segundo avanza todas las partidas."""
+        bucle = asyncio.get_running_loop()
+        paso = 1.0 / self.ticks_por_segundo
+        siguiente = bucle.time()
+        while True:
+            siguiente += paso
+            self.tick()
+            await asyncio.sleep(max(0.0, siguiente - bucle.time()))
+
+    def tick(self):
+        """Avanza todas las partidas y deja en el buffer de cada cliente su delta (sin esperar la red)."""
+        inicio = time.perf_counter()
+        for escritor, partida in list(self.partidas.items()):
+            mensaje = partida.avanzar()
+            escritor.write(mensaje)
+            if mensaje[0] == TIPO_FIN or escritor.transport.get_write_buffer_size() > MAX_BUFFER_CLIENTE:
+                self._desconectar(escritor)
+        self.costos_tick.append(time.perf_counter() - inicio)
+
+
+# =================================================================
+# CLIENTE (réplica del estado a partir de los deltas)
+# =================================================================
+class EstadoRemoto:
+    """Copia del estado de una partida del servidor, armada con ESTADO + DELTAs."""
+    def __init__(self):
+        self.tick = 0
+        self.cuerpo = deque() # Celdas planas, la cabeza primero
+        self.manzana = -1
+        self.puntuacion = 0
+        self.vivo = True
+
+    def aplicar_estado(self, tick, ancho, alto, semilla, puntuacion, manzana, celdas):
+        self.tick, self.ancho, self.alto, self.semilla = tick, ancho, alto, semilla
+        self.puntuacion, self.manzana = puntuacion, manzana
+        self.cuerpo = deque(celdas)
+
+    def aplicar_delta(self, tick, cabeza, cola, manzana):
+        self.tick = tick
+        self.cuerpo.appendleft(cabeza)
+        if cola >= 0:
+            self.cuerpo.pop()
+        if manzana >= 0:
+            self.manzana = manzana
+            self.puntuacion += 1
+
+
+async def leer_mensaje(lector, estado):
+    """
+    Lee un mensaje del servidor y lo aplica a `estado`. Retorna el tipo. Si el
+    servidor corta la conexión lanza asyncio.IncompleteReadError o ConnectionError
+    (ej. ConnectionResetError): el que llama decide qué hacer con la réplica.
+    """
+    tipo = (await lector.readexactly(1))[0]
+    if tipo == TIPO_DELTA:
+        _, tick, cabeza, cola, manzana, _ = DELTA.unpack(bytes([tipo]) + await lector.readexactly(DELTA.size - 1))
+        estado.aplicar_delta(tick, cabeza, cola, manzana)
+    elif tipo == TIPO_ESTADO:
+        (_, tick, ancho, alto, _, semilla, _, puntuacion, largo,
+         manzana) = ESTADO.unpack(bytes([tipo]) + await lector.readexactly(ESTADO.size - 1))
+        celdas = struct.unpack(f"<{largo}I", await lector.readexactly(4 * largo))
+        estado.aplicar_estado(tick, ancho, alto, semilla, puntuacion, manzana, celdas)
+    elif tipo == TIPO_FIN:
+        _, estado.tick = FIN.unpack(bytes([tipo]) + await lector.readexactly(FIN.size - 1))
+        estado.vivo = False
+    else:
+        raise ValueError(f"Mensaje desconocido del servidor: {tipo}")
+    return tipo
+
+
+def mensaje_giro(direccion, tick):
+    """Pide girar en el tick `tick` (si el servidor ya lo pasó, lo aplica en el siguiente)."""
+    return GIRO.pack(CODIGOS[direccion], tick)
+
+
+async def prueba_local(clientes, segundos, ticks_por_segundo):
+    """Servidor y `clientes` bots por loopback: giran al azar y al final se compara cada réplica con el servidor."""
+    servidor = ServidorSerpiente(ticks_por_segundo=ticks_por_segundo)
+    await servidor.iniciar(puerto=0)
+    puerto = servidor.servidor.sockets[0].getsockname()[1]
+
+    async def bot(semilla):
+        rng = random.Random(semilla)
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        estado = EstadoRemoto()
+        fin = asyncio.get_running_loop().time() + segundos
+        try:
+            while estado.vivo and asyncio.get_running_loop().time() < fin:
+                await leer_mensaje(lector, estado)
+                if rng.random() < 0.2:
+                    escritor.write(mensaje_giro(rng.choice(DIRECCIONES), estado.tick))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # El servidor cortó la conexión (ej. el bot no leía a tiempo): su partida ya no está
+        return lector, escritor, estado
+
+    resultados = await asyncio.gather(*(bot(i) for i in range(clientes)))
+    servidor.tarea_ticks.cancel() # Se congela el servidor para comparar sin que avance
+    por_direccion = {escritor.get_extra_info("peername"): partida for escritor, partida in servidor.partidas.items()}
+    coinciden = 0
+    for lector, escritor, estado in resultados:
+        partida = por_direccion.get(escritor.get_extra_info("sockname"))
+        if partida:
+            motor = partida.motor
+            # La réplica termina de leer lo que el servidor ya mandó y debe quedar igual que el motor
+            try:
+                while estado.tick < motor.ticks:
+                    await leer_mensaje(lector, estado)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass # La réplica queda incompleta y cuenta como que no coincide
+            manzana_x, manzana_y = motor.mecanicas_manzana.obtener_coordenadas()
+            coinciden += (list(estado.cuerpo) == list(motor.cuerpo) and estado.puntuacion == motor.puntuacion
+                          and estado.manzana == manzana_y * motor.ancho + manzana_x)
+        escritor.close()
+    await servidor.cerrar()
+
+    costos = sorted(servidor.costos_tick)
+    print(f"{clientes} clientes, {ticks_por_segundo} ticks/s durante {segundos} s")
+    print(f"  Costo del tick (todas las partidas): p50 {costos[len(costos) // 2] * 1000:.3f} ms, "
+          f"máx {costos[-1] * 1000:.3f} ms")
+    print(f"  Réplicas que coinciden con el servidor: {coinciden}/{clientes}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor autoritativo del Snake (TCP)")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--ticks", type=int, default=TICKS_POR_SEGUNDO, help="ticks por segundo")
+    parser.add_argument("--prueba", type=int, metavar="CLIENTES",
+                        help="en vez de servir, corre una prueba con clientes bot por loopback")
+    parser.add_argument("--segundos", type=float, default=3.0, help="duración de la prueba")
+    argumentos = parser.parse_args()
+
+    if argumentos.prueba:
+        asyncio.run(prueba_local(argumentos.prueba, argumentos.segundos, argumentos.ticks))
+    else:
+        async def servir():
+            servidor = ServidorSerpiente(ticks_por_segundo=argumentos.ticks)
+            await servidor.iniciar("0.0.0.0", argumentos.puerto)
+            print(f"Servidor escuchando en el puerto {argumentos.puerto}")
+            await servidor.servidor.serve_forever()
+        asyncio.run(servir())